@@ -0,0 +1,29 @@
+# Entry point for ``python -m src.ui``. Launching from a package ``__main__`` keeps
+# spawned parse workers from re-importing (and rebuilding) the Gradio UI module.
+
+import os
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Suppress Gradio version warning
+    os.environ["GRADIO_ANALYTICS_ENABLED"] = "False"
+
+    import gradio as gr
+
+    from src.ui.paperqa2_ui import demo
+
+    try:
+        demo.launch(
+            theme=gr.themes.Soft(),
+            css_paths=[Path(__file__).parent / "static" / "pqa.css"],
+            server_name="0.0.0.0",
+            server_port=7860,
+            share=False,
+            show_error=True,
+            quiet=False,
+        )
+    except OSError as e:
+        if "address already in use" in str(e):
+            print("❌ Port 7860 is already in use. Try: make kill-server")
+        else:
+            raise
@@ -5,27 +5,75 @@ Based on insights from GitHub discussions and testing.
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
+import heapq
+import itertools
 import warnings
 import html
+import io
 import logging
 import os
+import pickle
 import time
 import re
+import shutil
+import sqlite3
+import struct
 from pathlib import Path
-from typing import List, Tuple, Any, Dict, Generator
+from typing import (
+    List,
+    Tuple,
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    NamedTuple,
+    Optional,
+)
 import json
 import csv
 import zipfile
-from queue import Queue, Empty
+from collections import Counter, OrderedDict, deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import itemgetter
+from queue import SimpleQueue
 import threading
 
 import gradio as gr
 import httpx
+import litellm
 from paperqa import Docs, Settings
 from paperqa.agents.tools import DEFAULT_TOOL_NAMES
-import importlib
 
 from ..config_manager import ConfigManager
+from .pdf_worker import parse_document
+
+# Prefer orjson for session exports and LLM JSON parsing; stdlib otherwise
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _jsonl_line(obj: Any) -> bytes:
+        return orjson.dumps(
+            obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _jsonl_line(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+    _json_loads = json.loads
 
 # Configure logging with INFO level for cleaner output and ensure handlers
 logging.basicConfig(level=logging.INFO)
@@ -58,22 +106,242 @@ app_state: Dict[str, Any] = {
     "docs": None,
     "status_tracker": None,
     "processing_status": "",
-    "query_lock": None,
+    # Single-query lock; questions all run on the query loop, where it binds
+    "query_lock": asyncio.Lock(),
     "analysis_queue": None,
     "query_loop": None,
     "query_loop_thread": None,
     "session_data": None,
+    # Rendered export bytes/paths for the current session_data; cleared when it changes
+    "export_cache": {},
+    # Rendered outputs of past questions, by settings and question (see _answer_cache_*)
+    "answer_cache": None,
+    # Answer tokens of the in-flight Docs.aquery, polled by ask_with_progress
+    "answer_stream": [],
+    "parse_pool": None,
+    # Async client for batched Ollama embeddings; lives on the query loop
+    "ollama_aclient": None,
     "rewrite_info": None,
+    # Re-read on configuration change; keeps env lookups off the LLM call path
+    "openrouter_key": os.getenv("OPENROUTER_API_KEY", "").strip(),
+}
+
+# Curation controls when every UI control is at its default (read-only)
+_DEFAULT_CURATION: Dict[str, Any] = {
+    "per_doc_cap": 0,
+    "score_cutoff": 0.0,
+    "max_sources": 0,
 }
 
+# Minimum spacing between streamed metric events; the live panel refreshes
+# far slower than LLM callbacks fire, so extra updates are never rendered
+_METRIC_EMIT_INTERVAL_S = 0.2
+
+# Export filename suffixes: unique within the process and sortable across restarts
+_EXPORT_COUNTER = itertools.count(int(time.time()) * 1000)
+
+# Concurrent Docs.aadd calls when indexing an upload batch (non-Ollama models)
+_INDEX_CONCURRENCY = 4
+
+# Worker processes parsing uploaded PDFs in parallel (created on first upload)
+_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Chunk embeddings persisted across sessions (removed by `make clean-data`)
+_EMBED_CACHE_PATH = Path("./indexes/embedding_cache.sqlite")
+_EMBED_LRU_MAX = 8192
+
+# Indexed Docs corpus plus the uploads it covers, restored on the next launch
+_DOCS_CACHE_PATH = Path("./indexes/docs_cache.pkl")
+
+# Seconds allowed for re-adding every upload when the analysis stream rebuilds Docs
+_DOCS_REBUILD_TIMEOUT_S = 600
+
+# Chunks sent per Ollama /api/embed request
+_OLLAMA_EMBED_BATCH = 32
+
+# Answer cache: how many past questions are kept per corpus/settings combination
+_ANSWER_CACHE_MAX = 256
+
+# Shared worker pool for blocking per-request work (queries, pre-evidence streaming)
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pqa-worker")
+
+# Idle refresh period for the live analysis panel (elapsed time, spinner)
+_HEARTBEAT_INTERVAL_S = 2.0
+
+# Patterns used on every log line / evidence sentence; compiled once at import
+_RE_PROGRESS_FRAC = re.compile(
+    r"(\d+)\s*/\s*(\d+)(?:\s*(?:contexts?|evidence))?", re.IGNORECASE
+)
+_RE_CONTEXTS_SELECTED = re.compile(
+    r"contexts?\s*(?:selected)?\s*[:=]?\s*(\d+)", re.IGNORECASE
+)
+_RE_SELECTED = re.compile(r"selected\s*[:=]?\s*(\d+)", re.IGNORECASE)
+_RE_CANDIDATE_WORD = re.compile(r"\bcand(?:idate)?\b", re.IGNORECASE)
+_RE_SCORE_VALUE = re.compile(r"score\s*[:=]\s*([-+]?[0-9]*\.?[0-9]+)", re.IGNORECASE)
+_RE_SCORE_SPLIT = re.compile(r"score\s*[:=]", re.IGNORECASE)
+_RE_QUOTED_NAME = re.compile(r"[‘'\"]([^‘'\"]{5,120})[’'\"]")
+_RE_CANDIDATES = re.compile(r"candidates?\s*[:=]\s*(\d+)", re.IGNORECASE)
+_RE_MMR_LAMBDA = re.compile(
+    r"mmr[_\s-]*lambda\s*[:=]\s*([0-9]*\.?[0-9]+)", re.IGNORECASE
+)
+_RE_YEAR = re.compile(r"\b(20\d{2}|19\d{2})\b")
+_RE_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_RE_WS = re.compile(r"\s+")
+_VENUE_RES = (
+    re.compile(r"\b(Nature|Science|Cell|PNAS|NEJM|Lancet|BMJ|JAMA)\b", re.IGNORECASE),
+    # Journal Name YYYY pattern
+    re.compile(r"\b([A-Z][a-z]+ [A-Z][a-z]+)\b(?=\s*\d{4})", re.IGNORECASE),
+)
+
+# Inline markdown, LLM response cleanup, and query rewrite patterns
+# Links, bold, italic and code in one alternation; lastgroup picks the replacement
+_MD_INLINE_RE = re.compile(
+    r"\[(?P<label>[^\]]+)\]\((?P<link>https?://[^)\s]+)\)"
+    r"|\*\*(?P<bold>[^*]+)\*\*"
+    r"|(?<!\*)\*(?P<ital>[^*]+)\*(?!\*)"
+    r"|`(?P<code>[^`]+)`"
+)
+# Leading numbering/bullet markers: "\1", "1.", "1)", "(1)", "-", "*", "•"
+_BULLET_PREFIX_RE = re.compile(r"^\s*(?:\\\\?\d+\s+|\(\d+\)|\d+[\.)]|[-*•])\s*")
+_FENCE_RE = re.compile(r"^```[a-zA-Z0-9]*\n?|```$")
+_JSON_TAIL_RE = re.compile(r"\{[\s\S]*\}$")
+
+# Strong-claim wording flagged by the heuristic critique
+_RISKY_TERMS: Tuple[str, ...] = ("significant", "novel", "first", "proves", "causes")
+# Plain substring match on the lowercased answer, as the original ``in`` scans did
+_RISKY_RE = re.compile("|".join(map(re.escape, _RISKY_TERMS)))
+
+# Multi-term matcher for the risky-term check: Aho-Corasick when pyahocorasick is
+# installed (linear in the answer however many terms are added), regex otherwise
+try:
+    import ahocorasick
+
+    _RISKY_AC = ahocorasick.Automaton()
+    for _term in _RISKY_TERMS:
+        _RISKY_AC.add_word(_term, len(_term))
+    _RISKY_AC.make_automaton()
+
+    def _has_risky(s: str) -> bool:
+        return next(_RISKY_AC.iter(s.lower()), None) is not None
+
+except ImportError:
+
+    def _has_risky(s: str) -> bool:
+        return _RISKY_RE.search(s.lower()) is not None
+
+
+_WHAT_IS_RE = re.compile(r"^(what is|what are)\s+", re.IGNORECASE)
+_QUERY_CORRECTIONS = {
+    "alzheimer's": "Alzheimer's",
+    "parkinson's": "Parkinson's",
+    "alzeimer": "Alzheimer",
+    "alzheimer": "Alzheimer",
+    "behaviour": "behavior",
+    "analyse": "analyze",
+    "organisation": "organization",
+    "optimise": "optimize",
+}
+_CORRECTIONS_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, _QUERY_CORRECTIONS)) + r")\b", re.IGNORECASE
+)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,;:.!?])")
+_REPEATED_PUNCT_RE = re.compile(r"([,;:.!?]){2,}")
+_TERMINAL_PUNCT_RE = re.compile(r"[?!.]{2,}$")
+
+# Research Intel contradiction heuristic: opposing terms mentioned across sources.
+# The lookahead makes finditer report every (possibly overlapping) occurrence, so
+# membership matches a plain substring test.
+_ANTONYM_PAIRS = (
+    ("increase", "decrease"),
+    ("higher", "lower"),
+    ("improves", "worsens"),
+    ("upregulated", "downregulated"),
+    ("promotes", "inhibits"),
+    ("protective", "risk"),
+)
+_ANTONYM_RE = re.compile(
+    "(?=(" + "|".join(re.escape(w) for pair in _ANTONYM_PAIRS for w in pair) + "))"
+)
+_ANTONYM_BITS = {
+    w: 1 << k for k, w in enumerate(w for pair in _ANTONYM_PAIRS for w in pair)
+}
+
+# Static Research Intel panel fragments
+_INTEL_OPEN = (
+    "<div class='pqa-panel'><h4>Research Intel</h4>"
+    "<div><strong>Potential contradictions</strong><ul>"
+)
+_INTEL_NO_CONFLICTS = "<li>No explicit contradictions detected across sources.</li>"
+_INTEL_QFLAGS_OPEN = "<div style='margin-top:8px'><strong>Quality flags</strong><ul>"
+_INTEL_NO_QFLAGS = "<li><small>No quality flags detected.</small></li>"
+_INTEL_DIVERSITY_OPEN = (
+    "<div style='margin-top:8px'><strong>Diversity & recency</strong>"
+)
+_INTEL_LIST_CLOSE = "</ul></div>"
+
+# Claim polarity heuristic: "<verb> [in|of|on|for|to] <up to 5 words>" per sentence
+_CLAIM_VERB_POLARITY: Dict[str, int] = {
+    "increase": 1,
+    "increases": 1,
+    "increased": 1,
+    "higher": 1,
+    "upregulate": 1,
+    "upregulated": 1,
+    "upregulation": 1,
+    "promote": 1,
+    "promotes": 1,
+    "improve": 1,
+    "improves": 1,
+    "decrease": -1,
+    "decreases": -1,
+    "decreased": -1,
+    "lower": -1,
+    "downregulate": -1,
+    "downregulated": -1,
+    "downregulation": -1,
+    "inhibit": -1,
+    "inhibits": -1,
+    "worsen": -1,
+    "worsens": -1,
+}
+_NEGATIONS = ("no ", "not ", "does not ", "lack of ", "without ")
+_NEGATION_RE = re.compile("|".join(map(re.escape, _NEGATIONS)))
+_CLAIM_RE = re.compile(
+    r"(?P<verb>"
+    + "|".join(map(re.escape, sorted(_CLAIM_VERB_POLARITY, key=len, reverse=True)))
+    + r")[^a-zA-Z0-9]+(?:(?:in|of|on|for|to)\s+)?"
+    r"(?P<entity>[a-z0-9\-_/]+(?:\s+[a-z0-9\-_/]+){0,4})"
+)
+
 # Disable Gradio analytics
 os.environ["GRADIO_ANALYTICS_ENABLED"] = "False"
 
 
+# Pooled keep-alive client for the local Ollama server's management endpoints
+_OLLAMA_CLIENT = httpx.Client(
+    base_url="http://localhost:11434",
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+atexit.register(_OLLAMA_CLIENT.close)
+
+
+def _ollama_parallel() -> int:
+    """Concurrent requests to send to Ollama; 1 unless OLLAMA_NUM_PARALLEL opts in.
+
+    OLLAMA_NUM_PARALLEL is server-side configuration read by ``ollama serve`` at
+    startup; set it here only when the running server was started with it too.
+    """
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "")))
+    except ValueError:
+        return 1
+
+
 def check_ollama_status() -> bool:
     """Check if Ollama is running and accessible."""
     try:
-        response = httpx.get("http://localhost:11434/api/tags", timeout=5.0)
+        response = _OLLAMA_CLIENT.get("/api/tags")
         return bool(response.status_code == 200)
     except Exception:
         return False
@@ -82,118 +350,141 @@ def check_ollama_status() -> bool:
 class StatusTracker:
     """Simple status tracker for paper-qa operations."""
 
+    # Only the most recent updates are ever shown
+    MAX_UPDATES = 10
+
     def __init__(self) -> None:
-        self.status_updates: List[str] = []
-        self.current_step = 0
+        self.status_updates: Deque[str] = deque(maxlen=self.MAX_UPDATES)
+        # Rendered HTML, reused by status polls until the next update
+        self._html_cache: Optional[str] = None
 
     def add_status(self, status: str) -> None:
         """Add a status update."""
         self.status_updates.append(f"{time.strftime('%H:%M:%S')} - {status}")
+        self._html_cache = None
         logger.info(f"Status: {status}")
 
     def get_status_html(self) -> str:
         """Get formatted HTML of all status updates."""
+        if self._html_cache is not None:
+            return self._html_cache
         if not self.status_updates:
-            return "<div class='pqa-muted' style='text-align:center'>Ready to process questions</div>"
+            self._html_cache = "<div class='pqa-muted' style='text-align:center'>Ready to process questions</div>"
+            return self._html_cache
 
         html_parts = ["<div class='pqa-subtle'>"]
         html_parts.append("<strong>Processing Status</strong>")
         html_parts.append("<ul style='margin:6px 0 0 18px;padding:0'>")
-        for i, status in enumerate(self.status_updates[-10:], 1):
+        for status in self.status_updates:
             html_parts.append(f"<li><small>{status}</small></li>")
         html_parts.append("</ul>")
         html_parts.append("</div>")
-        return "".join(html_parts)
+        self._html_cache = "".join(html_parts)
+        return self._html_cache
 
     def clear(self) -> None:
         """Clear all status updates."""
-        self.status_updates = []
-        self.current_step = 0
+        self.status_updates.clear()
+        self._html_cache = None
 
 
 def initialize_settings(config_name: str = "optimized_ollama") -> Settings:
     """Initialize paper-qa settings with the specified configuration."""
     try:
-        config_manager = ConfigManager()
-        config_dict = config_manager.load_config(config_name)
-        # Hardening: avoid external metadata providers for faster, local-only flows
-        os.environ.setdefault("CROSSREF_MAILTO", "")
-        os.environ.setdefault("SEMANTIC_SCHOLAR_API_KEY", "")
-        os.environ.setdefault("PAPERQA_DISABLE_METADATA", "1")
-        settings = Settings(**config_dict)
-
-        # Tune settings for robust retrieval and research-intelligence defaults
+        settings = _build_settings(config_name)
+    except Exception as e:
+        logger.error(f"Failed to initialize Settings: {e}")
+        raise
+    app_state["settings"] = settings
+    if app_state.get("status_tracker") is None:
+        app_state["status_tracker"] = StatusTracker()
+    return settings
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_name: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parsed config JSON, keyed on the file's mtime so edits are re-read."""
+    return ConfigManager().load_config(config_name)
+
+
+def _build_settings(config_name: str) -> Settings:
+    """Load and tune a fresh Settings for a config.
+
+    Only the parsed JSON is memoized; callers (curation, retrieval tuning) mutate
+    the returned Settings, so every initialization builds its own.
+    """
+    config_path = ConfigManager().config_dir / f"{config_name}.json"
+    if not config_path.exists():
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    config_dict = _load_config_cached(config_name, config_path.stat().st_mtime_ns)
+    # Hardening: avoid external metadata providers for faster, local-only flows
+    os.environ.setdefault("CROSSREF_MAILTO", "")
+    os.environ.setdefault("SEMANTIC_SCHOLAR_API_KEY", "")
+    os.environ.setdefault("PAPERQA_DISABLE_METADATA", "1")
+    settings = Settings(**config_dict)
+
+    # Tune settings for robust retrieval and research-intelligence defaults
+    try:
+        # Prefer to allow evidence even with low scores and gather more contexts
+        settings.answer.evidence_relevance_score_cutoff = 0
+        settings.answer.answer_max_sources = max(10, settings.answer.answer_max_sources)
+        settings.answer.evidence_k = max(15, settings.answer.evidence_k)
+        settings.answer.get_evidence_if_no_contexts = True
+        settings.answer.group_contexts_by_question = True
+        settings.answer.answer_filter_extra_background = True
+        # Encourage retries and concurrency for richer evidence
+        if getattr(settings.answer, "max_answer_attempts", None) in (None, 0):
+            settings.answer.max_answer_attempts = 3
         try:
-            # Prefer to allow evidence even with low scores and gather more contexts
-            settings.answer.evidence_relevance_score_cutoff = 0
-            settings.answer.answer_max_sources = max(
-                10, settings.answer.answer_max_sources
-            )
-            settings.answer.evidence_k = max(15, settings.answer.evidence_k)
-            settings.answer.get_evidence_if_no_contexts = True
-            settings.answer.group_contexts_by_question = True
-            settings.answer.answer_filter_extra_background = True
-            # Encourage retries and concurrency for richer evidence
-            if getattr(settings.answer, "max_answer_attempts", None) in (None, 0):
-                settings.answer.max_answer_attempts = 3
+            # For local Ollama, one request at a time unless opted in (see above)
+            if (
+                str(settings.llm).lower().startswith("ollama/")
+                or "ollama" in str(settings.llm).lower()
+            ):
+                settings.answer.max_concurrent_requests = _ollama_parallel()
+            else:
+                settings.answer.max_concurrent_requests = max(
+                    2, settings.answer.max_concurrent_requests
+                )
+        except Exception:
+            pass
+    except Exception:
+        pass
+    try:
+        # Disable doc details to avoid network lookups if configs enabled them
+        settings.parsing.use_doc_details = False
+    except Exception:
+        pass
+    # Agent-side defaults to enhance research capabilities
+    try:
+        if hasattr(settings, "agent"):
+            settings.agent.should_pre_search = True
+            settings.agent.return_paper_metadata = True
             try:
-                # For local Ollama, reduce concurrency for stability
-                if (
-                    str(settings.llm).lower().startswith("ollama/")
-                    or "ollama" in str(settings.llm).lower()
-                ):
-                    settings.answer.max_concurrent_requests = 1
-                else:
-                    settings.answer.max_concurrent_requests = max(
-                        2, settings.answer.max_concurrent_requests
-                    )
+                settings.agent.agent_evidence_n = max(
+                    5, settings.agent.agent_evidence_n
+                )
             except Exception:
                 pass
-        except Exception:
-            pass
-        try:
-            # Disable doc details to avoid network lookups if configs enabled them
-            settings.parsing.use_doc_details = False
-        except Exception:
-            pass
-        # Agent-side defaults to enhance research capabilities
-        try:
-            if hasattr(settings, "agent"):
-                settings.agent.should_pre_search = True
-                settings.agent.return_paper_metadata = True
-                try:
-                    settings.agent.agent_evidence_n = max(
-                        5, settings.agent.agent_evidence_n
-                    )
-                except Exception:
-                    pass
-                try:
-                    settings.agent.search_count = max(20, settings.agent.search_count)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+            try:
+                settings.agent.search_count = max(20, settings.agent.search_count)
+            except Exception:
+                pass
+    except Exception:
+        pass
 
-        # Ensure clinical_trials_search is available if using agent
-        try:
-            tool_names = (
-                getattr(getattr(settings, "agent", object()), "tool_names", []) or []
-            )
-            if "clinical_trials_search" not in tool_names:
-                settings.agent.tool_names = DEFAULT_TOOL_NAMES + [
-                    "clinical_trials_search"
-                ]
-        except Exception:
-            pass
+    # Ensure clinical_trials_search is available if using agent
+    try:
+        tool_names = (
+            getattr(getattr(settings, "agent", object()), "tool_names", []) or []
+        )
+        if "clinical_trials_search" not in tool_names:
+            settings.agent.tool_names = DEFAULT_TOOL_NAMES + ["clinical_trials_search"]
+    except Exception:
+        pass
 
-        status_tracker = StatusTracker()
-        app_state["settings"] = settings
-        app_state["status_tracker"] = status_tracker
-        logger.info(f"Initialized Settings with config: {config_name}")
-        return settings
-    except Exception as e:
-        logger.error(f"Failed to initialize Settings: {e}")
-        raise
+    logger.info(f"Initialized Settings with config: {config_name}")
+    return settings
 
 
 def _ensure_query_loop() -> None:
@@ -210,6 +501,269 @@ def _ensure_query_loop() -> None:
     t.start()
     app_state["query_loop"] = loop
     app_state["query_loop_thread"] = t
+    # One pooled client for litellm's OpenAI-compatible providers; every LLM call
+    # is scheduled on this loop, so keep-alive connections are reused across asks
+    if getattr(litellm, "aclient_session", None) is None:
+        litellm.aclient_session = _new_llm_client()
+
+
+def _new_llm_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+
+
+async def _reset_llm_client() -> None:
+    """Swap litellm's pooled client for a fresh one after a dropped connection."""
+    old = getattr(litellm, "aclient_session", None)
+    litellm.aclient_session = _new_llm_client()
+    if old is not None:
+        try:
+            await old.aclose()
+        except Exception:
+            pass
+
+
+class EmbeddingCache:
+    """SQLite-backed store of chunk embeddings with an in-memory LRU in front.
+
+    Entries are keyed by ``(embedding model name, sha256(chunk text))`` and the
+    vectors are stored as little-endian float32, which is what embedding models
+    produce, so cached and freshly computed vectors rank contexts identically.
+    """
+
+    def __init__(self, path: Path, lru_max: int = _EMBED_LRU_MAX) -> None:
+        self._path = path
+        self._lru_max = lru_max
+        self._lru: "OrderedDict[Tuple[str, bytes], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings_f32 ("
+                "model TEXT NOT NULL, digest BLOB NOT NULL, vec BLOB NOT NULL, "
+                "PRIMARY KEY (model, digest))"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: Tuple[str, bytes], vec: List[float]) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        if len(self._lru) > self._lru_max:
+            self._lru.popitem(last=False)
+
+    def get_many(self, model: str, digests: List[bytes]) -> Dict[bytes, List[float]]:
+        """Return the cached vectors for whichever digests are known."""
+        hits: Dict[bytes, List[float]] = {}
+        with self._lock:
+            missing = []
+            for d in digests:
+                vec = self._lru.get((model, d))
+                if vec is None:
+                    missing.append(d)
+                else:
+                    self._lru.move_to_end((model, d))
+                    hits[d] = vec
+            db = self._db()
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                batch = missing[start : start + 500]
+                rows = db.execute(
+                    "SELECT digest, vec FROM embeddings_f32 WHERE model = ? AND digest IN "
+                    f"({','.join('?' * len(batch))})",
+                    (model, *batch),
+                )
+                for d, blob in rows:
+                    vec = list(struct.unpack(f"<{len(blob) // 4}f", blob))
+                    self._remember((model, d), vec)
+                    hits[d] = vec
+        return hits
+
+    def set_many(self, model: str, items: Dict[bytes, List[float]]) -> None:
+        """Persist freshly computed vectors."""
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings_f32 (model, digest, vec) VALUES (?, ?, ?)",
+                [
+                    (model, d, struct.pack(f"<{len(vec)}f", *vec))
+                    for d, vec in items.items()
+                ],
+            )
+            db.commit()
+            for d, vec in items.items():
+                self._remember((model, d), list(vec))
+
+
+_EMBED_CACHE = EmbeddingCache(_EMBED_CACHE_PATH)
+
+
+class CachedEmbeddingModel:
+    """Wrap a paper-qa embedding model so only unseen chunks are embedded."""
+
+    def __init__(
+        self,
+        inner: Any,
+        cache: EmbeddingCache = _EMBED_CACHE,
+        ollama_base: Optional[str] = None,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        # Set for ollama/* models: misses go to Ollama's batched /api/embed
+        self._ollama_base = ollama_base
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        model = str(getattr(self._inner, "name", "") or type(self._inner).__name__)
+        digests = [hashlib.sha256(t.encode("utf-8")).digest() for t in texts]
+        try:
+            vectors = await asyncio.to_thread(self._cache.get_many, model, digests)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            vectors = {}
+        # Embed each distinct missing chunk once, in first-seen order
+        todo: Dict[bytes, str] = {}
+        for d, t in zip(digests, texts):
+            if d not in vectors:
+                todo.setdefault(d, t)
+        if todo:
+            fresh = await self._embed(model, list(todo.values()))
+            computed = dict(zip(todo, fresh))
+            vectors.update(computed)
+            try:
+                await asyncio.to_thread(self._cache.set_many, model, computed)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+        logger.info(
+            f"Embedding cache: {len(texts) - len(todo)}/{len(texts)} chunk(s) reused"
+        )
+        return [vectors[d] for d in digests]
+
+    async def _embed(self, model: str, texts: List[str]) -> List[List[float]]:
+        if self._ollama_base and model.startswith("ollama/"):
+            try:
+                return await _ollama_embed_batched(
+                    self._ollama_base, model.split("/", 1)[1], texts
+                )
+            except Exception as e:
+                logger.warning(f"Ollama /api/embed failed ({e}); using paper-qa")
+        return list(await self._inner.embed_documents(texts=texts))
+
+
+async def _ollama_embed_batched(
+    base_url: str, model: str, texts: List[str]
+) -> List[List[float]]:
+    """Embed texts with one /api/embed request per batch of _OLLAMA_EMBED_BATCH."""
+    client = app_state.get("ollama_aclient")
+    if client is None:
+        client = httpx.AsyncClient(timeout=60.0)
+        app_state["ollama_aclient"] = client
+    url = base_url.rstrip("/") + "/api/embed"
+    out: List[List[float]] = []
+    for start in range(0, len(texts), _OLLAMA_EMBED_BATCH):
+        batch = texts[start : start + _OLLAMA_EMBED_BATCH]
+        resp = await client.post(url, json={"model": model, "input": batch})
+        resp.raise_for_status()
+        embeddings = resp.json()["embeddings"]
+        if len(embeddings) != len(batch):
+            raise ValueError(f"expected {len(batch)} embeddings, got {len(embeddings)}")
+        out.extend(embeddings)
+    return out
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _save_docs_cache(settings: Settings) -> None:
+    """Pickle the Docs corpus with the embedding model and upload hashes it used."""
+    uploads = list(app_state.get("uploaded_docs", []))
+    payload = {
+        "embedding": str(getattr(settings, "embedding", "")),
+        "files": {d["path"]: _file_sha256(d["path"]) for d in uploads},
+        "uploaded_docs": uploads,
+        "docs": app_state["docs"],
+    }
+    _DOCS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _DOCS_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp, _DOCS_CACHE_PATH)
+
+
+def _load_docs_cache(settings: Settings) -> bool:
+    """Restore a saved corpus if its embedding model and files are unchanged."""
+    if not _DOCS_CACHE_PATH.exists():
+        return False
+    try:
+        payload = pickle.loads(_DOCS_CACHE_PATH.read_bytes())
+        if payload["embedding"] != str(getattr(settings, "embedding", "")):
+            logger.info("Saved Docs corpus uses another embedding model; ignoring it")
+            return False
+        for path, digest in payload["files"].items():
+            if not os.path.exists(path) or _file_sha256(path) != digest:
+                logger.info(f"Saved Docs corpus is stale ({path} changed); ignoring it")
+                return False
+    except Exception as e:
+        logger.warning(f"Failed to load saved Docs corpus: {e}")
+        return False
+    app_state["docs"] = payload["docs"]
+    app_state["uploaded_docs"] = payload["uploaded_docs"]
+    logger.info(f"Restored {len(payload['uploaded_docs'])} indexed document(s)")
+    return True
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    """Shared process pool for document parsing; spawned to avoid forking threads.
+
+    Spawned workers re-import the parent's ``__main__``, so the app is launched
+    via ``python -m src.ui`` (skipped by multiprocessing) rather than this module.
+    """
+    pool = app_state.get("parse_pool")
+    if pool is None:
+        pool = ProcessPoolExecutor(
+            max_workers=_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        app_state["parse_pool"] = pool
+        atexit.register(pool.shutdown, cancel_futures=True)
+    return pool
+
+
+def _cached_embedding_model(settings: Settings) -> CachedEmbeddingModel:
+    """Embedding model for ``settings`` backed by the shared on-disk cache."""
+    config = getattr(settings, "embedding_config", None) or {}
+    return CachedEmbeddingModel(
+        settings.get_embedding_model(),
+        ollama_base=config.get("api_base") or "http://localhost:11434",
+    )
+
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy a file as a reflink when the filesystem allows it, else via shutil.
+
+    ``shutil.copy2`` already copies in-kernel (``sendfile``/``fcopyfile``), so the
+    fallback only pays for the data once; a reflink avoids writing it at all.
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        shutil.copystat(src, dst)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copy2(src, dst)
 
 
 async def process_uploaded_files_async(files: List[Any]) -> Tuple[str, str]:
@@ -223,6 +777,8 @@ async def process_uploaded_files_async(files: List[Any]) -> Tuple[str, str]:
 
     processed_files = []
     failed_files = []
+    # (display name, destination path) of copied files awaiting indexing
+    staged: List[Tuple[str, Path]] = []
 
     try:
         # Initialize settings if needed
@@ -262,8 +818,8 @@ async def process_uploaded_files_async(files: List[Any]) -> Tuple[str, str]:
                         source_path = Path("./papers") / Path(str(orig_name)).name
                         try:
                             source_path.parent.mkdir(parents=True, exist_ok=True)
-                            with open(source_path, "wb") as f:
-                                f.write(data)
+                            # Raw bytes go straight to papers/, off the event loop
+                            await asyncio.to_thread(source_path.write_bytes, data)
                             wrote_bytes = True
                         except Exception:
                             pass
@@ -293,76 +849,117 @@ async def process_uploaded_files_async(files: List[Any]) -> Tuple[str, str]:
                         f"File {source_path.name} is already in papers directory, skipping copy"
                     )
                 else:
-                    # Copy file to papers directory
-                    import shutil
-
-                    if hasattr(file_obj, "name"):
-                        # For file objects, use the object directly
-                        shutil.copy2(file_obj.name, dest_path)
-                    else:
-                        # For string paths, use the path
-                        shutil.copy2(source_path, dest_path)
+                    # Copy file to papers directory off the event loop
+                    await asyncio.to_thread(_fast_copy, source_path, dest_path)
 
                 logger.info(f"Successfully copied: {source_path.name}")
                 if "status_tracker" in app_state:
                     app_state["status_tracker"].add_status(
                         f"✅ Copied {source_path.name}"
                     )
+                staged.append((source_path.name, dest_path))
 
-                # Index the document into the in-memory Docs corpus
-                try:
-                    if "status_tracker" in app_state:
-                        app_state["status_tracker"].add_status(
-                            f"📚 Indexing {source_path.name}..."
-                        )
-                    t0 = time.time()
-                    # Use permanent path in papers directory on the dedicated query loop
-                    _ensure_query_loop()
-                    qloop = app_state["query_loop"]
-                    fut = asyncio.run_coroutine_threadsafe(
-                        app_state["docs"].aadd(
-                            str(dest_path), settings=app_state["settings"]
-                        ),
-                        qloop,
-                    )
-                    added_name = await asyncio.to_thread(fut.result, timeout=600)
-                    logger.info(
-                        f"Indexed {added_name or source_path.name} in {time.time() - t0:.2f}s"
-                    )
-                    if "status_tracker" in app_state:
-                        app_state["status_tracker"].add_status(
-                            f"📘 Indexed {source_path.name}"
-                        )
-                except Exception as index_err:
-                    logger.error(f"Failed to index {source_path.name}: {index_err}")
-                    failed_files.append(
-                        f"{source_path.name}: indexing failed: {str(index_err)}"
+            except Exception as e:
+                logger.error(f"Failed to process {source_path.name}: {e}")
+                failed_files.append(f"{source_path.name}: {str(e)}")
+                if "status_tracker" in app_state:
+                    app_state["status_tracker"].add_status(
+                        f"❌ Failed to process {source_path.name}"
                     )
+
+        # Index all staged files into the in-memory Docs corpus concurrently on the
+        # dedicated query loop; Ollama gets one at a time unless opted in
+        if staged:
+            settings = app_state["settings"]
+            docs = app_state["docs"]
+            model_names = (
+                f"{getattr(settings, 'llm', '')} {getattr(settings, 'embedding', '')}"
+            )
+            limit = (
+                _ollama_parallel()
+                if "ollama" in model_names.lower()
+                else _INDEX_CONCURRENCY
+            )
+            embedder = _cached_embedding_model(settings)
+
+            async def _index_all() -> List[Any]:
+                sem = asyncio.Semaphore(limit)
+
+                async def _index_one(path: Path) -> Any:
+                    async with sem:
+                        # Parse in a worker process, then embed and merge here
+                        try:
+                            parsed = await asyncio.get_running_loop().run_in_executor(
+                                _parse_pool(), parse_document, str(path), settings
+                            )
+                        except Exception as e:
+                            logger.warning(
+                                f"Parsing {path.name} in a worker failed ({e}); "
+                                "indexing in-process"
+                            )
+                            return await docs.aadd(
+                                str(path), settings=settings, embedding_model=embedder
+                            )
+                        for doc in parsed.docs.values():
+                            await docs.aadd_texts(
+                                [t for t in parsed.texts if t.doc.dockey == doc.dockey],
+                                doc,
+                                settings=settings,
+                                embedding_model=embedder,
+                            )
+                        return parsed
+
+                return await asyncio.gather(
+                    *[_index_one(dest) for _, dest in staged], return_exceptions=True
+                )
+
+            if "status_tracker" in app_state:
+                app_state["status_tracker"].add_status(
+                    f"📚 Indexing {len(staged)} document(s)..."
+                )
+            t0 = time.time()
+            _ensure_query_loop()
+            fut = asyncio.run_coroutine_threadsafe(
+                _index_all(), app_state["query_loop"]
+            )
+            try:
+                results = await asyncio.to_thread(
+                    fut.result, timeout=600 * -(-len(staged) // limit)
+                )
+            except Exception as index_err:
+                results = [index_err] * len(staged)
+            logger.info(f"Indexed {len(staged)} file(s) in {time.time() - t0:.2f}s")
+
+            for (name, dest_path), res in zip(staged, results):
+                if isinstance(res, BaseException):
+                    logger.error(f"Failed to index {name}: {res}")
+                    failed_files.append(f"{name}: indexing failed: {str(res)}")
                     if "status_tracker" in app_state:
                         app_state["status_tracker"].add_status(
-                            f"❌ Failed to index {source_path.name}"
+                            f"❌ Failed to index {name}"
                         )
                     continue
+                if "status_tracker" in app_state:
+                    app_state["status_tracker"].add_status(f"📘 Indexed {name}")
 
                 # Update app state
                 doc_info = {
-                    "filename": source_path.name,
+                    "filename": name,
                     "size": dest_path.stat().st_size if dest_path.exists() else 0,
                     "status": "Ready",
                     "path": str(dest_path),
                 }
                 app_state["uploaded_docs"].append(doc_info)
-                processed_files.append(source_path.name)
+                processed_files.append(name)
 
-                logger.info(f"Successfully processed: {source_path.name}")
+                logger.info(f"Successfully processed: {name}")
 
+        # Persist the grown corpus once per batch so a restart skips re-indexing
+        if processed_files:
+            try:
+                await asyncio.to_thread(_save_docs_cache, app_state["settings"])
             except Exception as e:
-                logger.error(f"Failed to process {source_path.name}: {e}")
-                failed_files.append(f"{source_path.name}: {str(e)}")
-                if "status_tracker" in app_state:
-                    app_state["status_tracker"].add_status(
-                        f"❌ Failed to process {source_path.name}"
-                    )
+                logger.warning(f"Failed to save Docs corpus: {e}")
 
         # Update final status
         if "status_tracker" in app_state:
@@ -400,6 +997,70 @@ def process_uploaded_files(files: List[str]) -> Tuple[str, str]:
     return asyncio.run(process_uploaded_files_async(files))
 
 
+def _answer_cache_key(settings: Settings, run_critique: bool) -> Tuple[Any, ...]:
+    """Everything besides the question that changes what an answer looks like."""
+    try:
+        settings_key = settings.model_dump_json()
+    except Exception:
+        settings_key = repr(settings)
+    return (
+        settings_key,
+        tuple(d.get("path") for d in app_state.get("uploaded_docs", [])),
+        repr(app_state.get("curation")),
+        repr(app_state.get("ui_toggles")),
+        bool(app_state.get("use_quote_extraction", False)),
+        run_critique,
+    )
+
+
+def _normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question for exact cache hits."""
+    return " ".join(question.casefold().split()).rstrip("?.! ")
+
+
+def _answer_cache_lookup(key: Tuple[Any, ...], question: str) -> Optional[Any]:
+    """Return the cached payload for the same normalized question, if any."""
+    cache = app_state.get("answer_cache")
+    if not cache or cache["key"] != key:
+        return None
+    q = _normalize_question(question)
+    payload = cache["payloads"].get(q)
+    if payload is not None:
+        cache["payloads"].move_to_end(q)
+    return payload
+
+
+def _answer_cache_store(key: Tuple[Any, ...], question: str, payload: Any) -> None:
+    """Remember a question's outputs; a new key starts the cache over."""
+    cache = app_state.get("answer_cache")
+    if not cache or cache["key"] != key:
+        cache = {"key": key, "payloads": OrderedDict()}
+        app_state["answer_cache"] = cache
+    payloads = cache["payloads"]
+    payloads[_normalize_question(question)] = payload
+    payloads.move_to_end(_normalize_question(question))
+    while len(payloads) > _ANSWER_CACHE_MAX:
+        payloads.popitem(last=False)
+
+
+async def _query_streaming_answer(
+    docs: Docs, question: str, settings: Settings, on_token: Any
+) -> Any:
+    """Run Docs.aquery with only the answer prompt's tokens sent to ``on_token``.
+
+    Evidence is gathered first without callbacks, so the concurrent evidence
+    summaries (raw JSON with ``use_json``) never reach the stream; aquery on the
+    filled session then skips retrieval and streams just the answer.
+    """
+    session = await docs.aget_evidence(question, settings=settings)
+    return await docs.aquery(
+        session,
+        settings=settings,
+        # With no evidence aquery would gather again; keep that pass silent too
+        callbacks=[on_token] if session.contexts else None,
+    )
+
+
 async def process_question_async(
     question: str, config_name: str = "optimized_ollama", run_critique: bool = False
 ) -> Tuple[str, str, str, str, str, str, str, str]:
@@ -458,23 +1119,48 @@ async def process_question_async(
                 settings = initialize_settings(config_name)
                 app_state["settings"] = settings
 
-            # Ensure a single active query to avoid event-loop/client contention
-            if app_state.get("query_lock") is None:
-                app_state["query_lock"] = asyncio.Lock()
+            # Serve a repeated question (same wording up to case, spacing and end
+            # punctuation) from the answer cache, skipping retrieval and generation
+            answer_key = _answer_cache_key(settings, run_critique)
+            hit = _answer_cache_lookup(answer_key, question)
+            if hit is not None:
+                outputs, session_data = hit
+                if session_data is not None:
+                    app_state["export_cache"].clear()
+                    app_state["session_data"] = {
+                        **session_data,
+                        "question": question,
+                        "rewrite": app_state.get("rewrite_info"),
+                    }
+                if "status_tracker" in app_state:
+                    app_state["status_tracker"].add_status(
+                        "⚡ Reused the answer to an identical earlier question"
+                    )
+                app_state["processing_status"] = "✅ Answer generated successfully!"
+                logger.info("Answer cache hit; skipped retrieval and generation")
+                return outputs
 
+            # Ensure a single active query to avoid event-loop/client contention
             async with app_state["query_lock"]:
                 # Build Docs corpus from uploaded files if not already available
                 _ensure_query_loop()
                 qloop = app_state["query_loop"]
                 if app_state.get("docs") is None:
                     app_state["docs"] = Docs()
+                    embedder = _cached_embedding_model(settings)
                     for d in app_state.get("uploaded_docs", []):
                         try:
                             fut_add = asyncio.run_coroutine_threadsafe(
-                                app_state["docs"].aadd(d["path"], settings=settings),
+                                app_state["docs"].aadd(
+                                    d["path"],
+                                    settings=settings,
+                                    embedding_model=embedder,
+                                ),
                                 qloop,
                             )
-                            await asyncio.to_thread(fut_add.result, timeout=600)
+                            await asyncio.wait_for(
+                                asyncio.wrap_future(fut_add), timeout=600
+                            )
                         except Exception as e:
                             logger.warning(
                                 f"Skipping doc that failed to add: {d.get('filename')}: {e}"
@@ -483,50 +1169,51 @@ async def process_question_async(
                 try:
                     aq = app_state.get("analysis_queue")
                     if aq is not None:
-                        aq.put(
+                        aq.put_nowait(
                             {
                                 "type": "phase",
                                 "data": {"phase": "summaries", "status": "start"},
-                            },
-                            timeout=0.05,
+                            }
                         )
-                        aq.put(
+                        aq.put_nowait(
                             {
                                 "type": "phase",
                                 "data": {"phase": "answer", "status": "start"},
-                            },
-                            timeout=0.05,
+                            }
                         )
                 except Exception:
                     pass
 
-                # Query the in-memory Docs corpus on a dedicated long-lived loop
-                # Schedule coroutine on the background loop and wait from current loop
+                # Query the in-memory Docs corpus on the persistent worker loop and
+                # await its future directly; no helper thread sits blocked on it
                 aquery_start = time.time()
+                # Answer tokens land in a fresh list the UI generator renders live
+                answer_stream: List[str] = []
+                app_state["answer_stream"] = answer_stream
                 fut = asyncio.run_coroutine_threadsafe(
-                    app_state["docs"].aquery(question, settings=settings), qloop
+                    _query_streaming_answer(
+                        app_state["docs"], question, settings, answer_stream.append
+                    ),
+                    qloop,
                 )
-                # Wait in a thread to avoid blocking current event loop
-                session = await asyncio.to_thread(fut.result, timeout=600)
+                session = await asyncio.wait_for(asyncio.wrap_future(fut), timeout=600)
                 aquery_elapsed = time.time() - aquery_start
 
                 # Emit phase completion events and answer metrics
                 try:
                     aq = app_state.get("analysis_queue")
                     if aq is not None:
-                        aq.put(
+                        aq.put_nowait(
                             {
                                 "type": "phase",
                                 "data": {"phase": "summaries", "status": "end"},
-                            },
-                            timeout=0.05,
+                            }
                         )
-                        aq.put(
+                        aq.put_nowait(
                             {
                                 "type": "phase",
                                 "data": {"phase": "answer", "status": "end"},
-                            },
-                            timeout=0.05,
+                            }
                         )
                         # Emit answer generation stats
                         try:
@@ -542,7 +1229,7 @@ async def process_question_async(
                                         total_chars += len(t)
                                 except Exception:
                                     continue
-                            aq.put(
+                            aq.put_nowait(
                                 {
                                     "type": "answer_stats",
                                     "data": {
@@ -551,8 +1238,7 @@ async def process_question_async(
                                         "approx_prompt_chars": total_chars,
                                         "attempts": 1,
                                     },
-                                },
-                                timeout=0.05,
+                                }
                             )
                         except Exception:
                             pass
@@ -613,121 +1299,133 @@ async def process_question_async(
                 )
 
             # Optional critique (LLM-backed when configured; falls back to heuristic)
-            critique_html = ""
-            if run_critique and answer:
+            async def _critique() -> str:
+                if not (run_critique and answer):
+                    return ""
                 try:
-                    critique_html = await build_llm_or_heuristic_critique_html(
+                    return await build_llm_or_heuristic_critique_html(
                         question, answer, contexts, settings
                     )
                 except Exception:
-                    critique_html = "<div class='pqa-subtle'><small class='pqa-muted'>Critique unavailable.</small></div>"
+                    return "<div class='pqa-subtle'><small class='pqa-muted'>Critique unavailable.</small></div>"
 
             # Optional quote extraction: use contexts as passages for LLM to extract verbatim quotes
-            quotes_html = ""
-            try:
-                if bool(app_state.get("use_quote_extraction", False)) and contexts:
-                    from .prompts import (
-                        QUOTE_EXTRACTION_SYSTEM_PROMPT,
-                        QUOTE_EXTRACTION_USER_TEMPLATE,
-                    )
+            async def _extract_quotes() -> str:
+                quotes_html = ""
+                try:
+                    if bool(app_state.get("use_quote_extraction", False)) and contexts:
+                        from .prompts import (
+                            QUOTE_EXTRACTION_SYSTEM_PROMPT,
+                            QUOTE_EXTRACTION_USER_TEMPLATE,
+                        )
 
-                    # Build passages block from contexts (cap large lists)
-                    lines: List[str] = []
-                    for idx, c in enumerate(contexts[: min(10000, len(contexts))], 1):
-                        try:
-                            txt_obj = getattr(c, "text", None)
-                            doc = (
-                                getattr(txt_obj, "doc", None)
-                                if txt_obj is not None
-                                else None
-                            )
-                            title = None
-                            page = getattr(c, "page", None)
-                            if doc is not None:
-                                title = getattr(doc, "title", None) or getattr(
-                                    doc, "docname", None
+                        # Build passages block from contexts (cap large lists)
+                        lines: List[str] = []
+                        for idx, c in enumerate(
+                            contexts[: min(10000, len(contexts))], 1
+                        ):
+                            try:
+                                txt_obj = getattr(c, "text", None)
+                                doc = (
+                                    getattr(txt_obj, "doc", None)
+                                    if txt_obj is not None
+                                    else None
                                 )
-                            text = (
-                                getattr(txt_obj, "text", None)
-                                if txt_obj is not None
-                                else (str(txt_obj) if txt_obj is not None else str(c))
+                                title = None
+                                page = getattr(c, "page", None)
+                                if doc is not None:
+                                    title = getattr(doc, "title", None) or getattr(
+                                        doc, "docname", None
+                                    )
+                                text = (
+                                    getattr(txt_obj, "text", None)
+                                    if txt_obj is not None
+                                    else (
+                                        str(txt_obj) if txt_obj is not None else str(c)
+                                    )
+                                )
+                                snippet = text if isinstance(text, str) else ""
+                                lines.append(
+                                    f"id: P{idx:04d} | title: {title or '-'} | page: {int(page) if isinstance(page, (int, float)) else '-'}\ntext: {snippet}"
+                                )
+                            except Exception:
+                                continue
+                        passages_block = "\n\n".join(lines)
+                        # Call LLM
+                        messages = [
+                            {
+                                "role": "system",
+                                "content": QUOTE_EXTRACTION_SYSTEM_PROMPT,
+                            },
+                            {
+                                "role": "user",
+                                "content": QUOTE_EXTRACTION_USER_TEMPLATE.format(
+                                    question=question, passages_block=passages_block
+                                ),
+                            },
+                        ]
+                        try:
+                            # Use OpenRouter key when available and using an openrouter/* model;
+                            # run on the query loop so the shared HTTP client stays on one loop
+                            _ensure_query_loop()
+                            fut_q = asyncio.run_coroutine_threadsafe(
+                                litellm.acompletion(
+                                    **_llm_kwargs(
+                                        str(settings.llm), messages, timeout=45
+                                    )
+                                ),
+                                app_state["query_loop"],
                             )
-                            snippet = text if isinstance(text, str) else ""
-                            lines.append(
-                                f"id: P{idx:04d} | title: {title or '-'} | page: {int(page) if isinstance(page, (int, float)) else '-'}\ntext: {snippet}"
+                            resp = await asyncio.wait_for(
+                                asyncio.wrap_future(fut_q), timeout=50
                             )
-                        except Exception:
-                            continue
-                    passages_block = "\n\n".join(lines)
-                    # Call LLM
-                    import litellm
-
-                    messages = [
-                        {"role": "system", "content": QUOTE_EXTRACTION_SYSTEM_PROMPT},
-                        {
-                            "role": "user",
-                            "content": QUOTE_EXTRACTION_USER_TEMPLATE.format(
-                                question=question, passages_block=passages_block
-                            ),
-                        },
-                    ]
-                    try:
-                        # Use OpenRouter key when available and using an openrouter/* model
-                        _kwargs: Dict[str, Any] = {
-                            "model": str(settings.llm),
-                            "messages": messages,
-                            "timeout": 45,
-                        }
-                        # Respect configured LiteLLM router via environment; do not hardcode here
-                        resp = await litellm.acompletion(**_kwargs)
-                        content = getattr(resp, "content", None)
-                        if not isinstance(content, str):
-                            choices = getattr(resp, "choices", None)
-                            if isinstance(choices, list) and choices:
-                                message = getattr(choices[0], "message", None)
-                                content = (
-                                    message.get("content")
-                                    if isinstance(message, dict)
-                                    else getattr(message, "content", None)
-                                )
-                        import json as _json
+                            content = _response_content(resp)
+                            import json as _json
 
-                        if isinstance(content, str):
-                            try:
-                                data = _json.loads(content)
-                                quotes = data.get("quotes") or []
-                                if quotes:
-                                    parts = [
-                                        "<div class='pqa-panel'><strong>Extracted Quotes</strong><ul>"
-                                    ]
-                                    for qit in quotes[:12]:
-                                        qtxt = str(qit.get("quote") or "").strip()
-                                        rat = str(qit.get("rationale") or "").strip()
-                                        doc_title = (
-                                            qit.get("doc_title")
-                                            or qit.get("doc_id")
-                                            or "-"
-                                        )
-                                        page = qit.get("page")
-                                        page_str = (
-                                            f" p.{int(page)}"
-                                            if isinstance(page, (int, float))
-                                            else ""
-                                        )
-                                        if qtxt:
-                                            parts.append(
-                                                f'<li><div><em>"{html.escape(qtxt[:400])}"</em></div>'
-                                                f"<div><small class='pqa-muted'>{html.escape(doc_title)}{page_str}</small></div>"
-                                                f"<div><small>{html.escape(rat[:300])}</small></div></li>"
+                            if content:
+                                try:
+                                    data = _json.loads(content)
+                                    quotes = data.get("quotes") or []
+                                    if quotes:
+                                        parts = [
+                                            "<div class='pqa-panel'><strong>Extracted Quotes</strong><ul>"
+                                        ]
+                                        for qit in quotes[:12]:
+                                            qtxt = str(qit.get("quote") or "").strip()
+                                            rat = str(
+                                                qit.get("rationale") or ""
+                                            ).strip()
+                                            doc_title = (
+                                                qit.get("doc_title")
+                                                or qit.get("doc_id")
+                                                or "-"
                                             )
-                                    parts.append("</ul></div>")
-                                    quotes_html = "".join(parts)
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-            except Exception:
-                quotes_html = ""
+                                            page = qit.get("page")
+                                            page_str = (
+                                                f" p.{int(page)}"
+                                                if isinstance(page, (int, float))
+                                                else ""
+                                            )
+                                            if qtxt:
+                                                parts.append(
+                                                    f'<li><div><em>"{html.escape(qtxt[:400])}"</em></div>'
+                                                    f"<div><small class='pqa-muted'>{html.escape(doc_title)}{page_str}</small></div>"
+                                                    f"<div><small>{html.escape(rat[:300])}</small></div></li>"
+                                                )
+                                        parts.append("</ul></div>")
+                                        quotes_html = "".join(parts)
+                                except Exception:
+                                    pass
+                        except Exception:
+                            pass
+                except Exception:
+                    quotes_html = ""
+                return quotes_html
+
+            # Both only read the answer/contexts, so overlap their LLM round-trips
+            critique_html, quotes_html = await asyncio.gather(
+                _critique(), _extract_quotes()
+            )
 
             answer_html = format_answer_html(answer, contexts)
             sources_html = (quotes_html or "") + format_sources_html(contexts)
@@ -777,6 +1475,7 @@ async def process_question_async(
                             else None,
                         }
                     )
+                app_state["export_cache"].clear()
                 app_state["session_data"] = {
                     "question": question,
                     "answer": answer,
@@ -793,7 +1492,7 @@ async def process_question_async(
             except Exception:
                 pass
 
-            return (
+            outputs = (
                 answer_html,
                 sources_html,
                 intelligence_html,
@@ -803,6 +1502,11 @@ async def process_question_async(
                 top_evidence_html,
                 evidence_meta_summary_html,
             )
+            if answer:
+                _answer_cache_store(
+                    answer_key, question, (outputs, app_state.get("session_data"))
+                )
+            return outputs
 
         except Exception as e:
             logger.error(
@@ -812,16 +1516,6 @@ async def process_question_async(
 
             # Check if it's an Ollama connection issue
             if "Event loop is closed" in str(e):
-                # Attempt to reset LiteLLM async client to avoid stale-loop issues, then retry
-                try:
-                    import litellm  # runtime-only optional dependency
-
-                    importlib.reload(litellm)
-                    logger.info(
-                        "Reloaded litellm to reset async HTTP client after loop-close error"
-                    )
-                except Exception:
-                    pass
                 if attempt < max_retries - 1:
                     await asyncio.sleep(retry_delay)
                     retry_delay *= 2
@@ -835,6 +1529,8 @@ async def process_question_async(
                     logger.info(
                         f"Connection issue detected, retrying in {retry_delay} seconds..."
                     )
+                    # Drop pooled connections that may be dead before retrying
+                    await _reset_llm_client()
                     await asyncio.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                     continue
@@ -855,6 +1551,9 @@ def process_question(
     question: str, config_name: str = "optimized_ollama", run_critique: bool = False
 ) -> Tuple[str, str, str, str, str, str, str, str, str, str]:
     """Synchronous wrapper for process_question_async."""
+    # Run on the persistent worker loop instead of spinning up a loop per question;
+    # the query lock and litellm's pooled client stay bound to that one loop
+    _ensure_query_loop()
     (
         answer_html,
         sources_html,
@@ -864,7 +1563,10 @@ def process_question(
         evidence_summary_html,
         top_evidence_html,
         evidence_meta_summary_html,
-    ) = asyncio.run(process_question_async(question, config_name, run_critique))
+    ) = asyncio.run_coroutine_threadsafe(
+        process_question_async(question, config_name, run_critique),
+        app_state["query_loop"],
+    ).result()
 
     # Get status updates
     progress_html = ""
@@ -983,30 +1685,40 @@ def ask_with_progress(
         except Exception:
             app_state["rewrite_info"] = {"original": original_question}
 
-    # Apply evidence curation settings
+    # Apply evidence curation settings (fast path when all controls are at defaults)
     try:
         settings_cur = app_state.get("settings") or initialize_settings(config_name)
         try:
-            settings_cur.answer.evidence_relevance_score_cutoff = float(score_cutoff)
-        except Exception:
-            pass
-        try:
-            if isinstance(max_sources, int) and max_sources > 0:
-                settings_cur.answer.answer_max_sources = int(max_sources)
+            cutoff_f = float(score_cutoff)
+            # Assign only on change; each assignment re-validates settings.answer
+            if settings_cur.answer.evidence_relevance_score_cutoff != cutoff_f:
+                settings_cur.answer.evidence_relevance_score_cutoff = cutoff_f
         except Exception:
             pass
         app_state["settings"] = settings_cur
-        app_state["curation"] = {
-            "per_doc_cap": int(per_doc_cap) if isinstance(per_doc_cap, int) else 0,
-            "score_cutoff": float(score_cutoff)
-            if isinstance(score_cutoff, (int, float))
-            else 0.0,
-            "max_sources": int(max_sources) if isinstance(max_sources, int) else 0,
-        }
-        app_state["ui_toggles"] = {
-            "show_flags": bool(show_flags),
-            "show_conflicts": bool(show_conflicts),
-        }
+        if score_cutoff or per_doc_cap or max_sources:
+            try:
+                if isinstance(max_sources, int) and max_sources > 0:
+                    settings_cur.answer.answer_max_sources = int(max_sources)
+            except Exception:
+                pass
+            app_state["curation"] = {
+                "per_doc_cap": int(per_doc_cap) if isinstance(per_doc_cap, int) else 0,
+                "score_cutoff": float(score_cutoff)
+                if isinstance(score_cutoff, (int, float))
+                else 0.0,
+                "max_sources": int(max_sources) if isinstance(max_sources, int) else 0,
+            }
+        else:
+            app_state["curation"] = _DEFAULT_CURATION
+        prev_ui = app_state.get("ui_toggles") or {}
+        if prev_ui.get("show_flags") is not bool(show_flags) or prev_ui.get(
+            "show_conflicts"
+        ) is not bool(show_conflicts):
+            app_state["ui_toggles"] = {
+                "show_flags": bool(show_flags),
+                "show_conflicts": bool(show_conflicts),
+            }
     except Exception:
         pass
 
@@ -1074,17 +1786,10 @@ def ask_with_progress(
             result_holder["evidence_meta_summary_html"],
         ) = process_question(question, config_name, run_critique)
 
-    t = threading.Thread(target=_run_query, daemon=True)
-    t.start()
+    app_state["answer_stream"] = []
+    fut = _EXECUTOR.submit(_run_query)
     synth_start = time.time()
-    # Reuse spinner style
-    spinner_css = (
-        "<style>@keyframes pqa-spin{0%{transform:rotate(0deg)}100%{transform:rotate(360deg)}}"
-        " .pqa-spinner{display:inline-block;width:14px;height:14px;border:2px solid #ccc;"
-        " border-top-color:#3b82f6;border-radius:50%;animation:pqa-spin 0.8s linear infinite;"
-        " margin-right:6px}</style>"
-    )
-    while t.is_alive():
+    while not fut.done():
         elapsed = time.time() - synth_start
         badges = (
             "<div style='margin:6px 0'>"
@@ -1093,18 +1798,22 @@ def ask_with_progress(
             "</div>"
         )
         synth_block = (
-            f"{spinner_css}<div class='pqa-panel' style='margin-top:8px;'>"
+            f"<div class='pqa-panel' style='margin-top:8px;'>"
             f"<span class='pqa-spinner'></span> Synthesizing answer"
             f" <small class='pqa-muted'>({elapsed:.1f}s)</small>"
             f"</div>"
         )
+        # Show the answer as it streams in; sources etc. follow once it completes
+        partial = "".join(app_state.get("answer_stream") or [])
         yield (
             panel_last + badges + synth_block,
+            format_answer_html(partial, []) if partial else "",
             "",
             "",
             "",
-            "",
-            "",
+            app_state["status_tracker"].get_status_html()
+            if app_state.get("status_tracker")
+            else "",
             gr.update(value="Running…", interactive=False),
             gr.update(),  # Keep current tab
             _update_progress_steps("evidence"),  # Evidence processing
@@ -1112,7 +1821,7 @@ def ask_with_progress(
             "",  # conflicts_html
             "",  # evidence_meta_summary_html
         )
-        time.sleep(0.75)
+        time.sleep(0.2 if partial else 0.75)
 
     # Attempt to auto-scroll to the answer section after analysis completes
     scroll_js = (
@@ -1149,15 +1858,18 @@ def ask_with_progress(
 
 
 def _run_pre_evidence_in_thread(
-    question: str, settings: Settings, docs: Docs, q: Queue
+    question: str, settings: Settings, docs: Docs, q: SimpleQueue
 ) -> None:
     """Background worker to run pre-evidence and stream callbacks into queue."""
     _ensure_query_loop()
     loop = app_state["query_loop"]
+    # The queue is unbounded, so rate-limit parsed metric updates at the producer;
+    # the final exact count is emitted once retrieval completes
+    last_metric_ts = [0.0]
 
     def cb(chunk: str) -> None:
         try:
-            q.put({"type": "log", "data": chunk}, timeout=0.1)
+            q.put_nowait({"type": "log", "data": chunk})
         except Exception:
             pass
         # Heuristic: parse progress counts from logs to update contexts_selected
@@ -1165,36 +1877,31 @@ def _run_pre_evidence_in_thread(
             text = str(chunk)
             cs: int | None = None
             # Pattern like "5/20" or "5 / 20 contexts"
-            m = re.search(
-                r"(\d+)\s*/\s*(\d+)(?:\s*(?:contexts?|evidence))?", text, re.I
-            )
+            m = _RE_PROGRESS_FRAC.search(text)
             if m:
                 cs = int(m.group(1))
             else:
-                m2 = re.search(r"contexts?\s*(?:selected)?\s*[:=]?\s*(\d+)", text, re.I)
+                m2 = _RE_CONTEXTS_SELECTED.search(text)
                 if m2:
                     cs = int(m2.group(1))
                 else:
-                    m3 = re.search(r"selected\s*[:=]?\s*(\d+)", text, re.I)
+                    m3 = _RE_SELECTED.search(text)
                     if m3:
                         cs = int(m3.group(1))
             if cs is not None:
-                try:
-                    q.put(
-                        {"type": "metric", "data": {"contexts_selected": cs}},
-                        timeout=0.05,
-                    )
-                except Exception:
-                    pass
+                now = time.monotonic()
+                if now - last_metric_ts[0] >= _METRIC_EMIT_INTERVAL_S:
+                    last_metric_ts[0] = now
+                    q.put_nowait({"type": "metric", "data": {"contexts_selected": cs}})
         except Exception:
             pass
         # Heuristic: parse candidate lines (doc name and/or score) from logs
         try:
             t = str(chunk)
-            if re.search(r"\bcand(?:idate)?\b", t, re.I):
+            if _RE_CANDIDATE_WORD.search(t):
                 # Extract optional score
                 sc: float | None = None
-                ms = re.search(r"score\s*[:=]\s*([-+]?[0-9]*\.?[0-9]+)", t, re.I)
+                ms = _RE_SCORE_VALUE.search(t)
                 if ms:
                     try:
                         sc = float(ms.group(1))
@@ -1202,17 +1909,17 @@ def _run_pre_evidence_in_thread(
                         sc = None
                 # Extract a doc/title-like token between quotes or before score
                 name = None
-                mq = re.search(r"[‘'\"]([^‘'\"]{5,120})[’'\"]", t)
+                mq = _RE_QUOTED_NAME.search(t)
                 if mq:
                     name = mq.group(1)
                 if not name:
                     # Fallback: take a trailing segment before score
-                    parts = re.split(r"score\s*[:=]", t, flags=re.I)
+                    parts = _RE_SCORE_SPLIT.split(t)
                     if parts:
                         seg = parts[0]
                         # Alnum and punctuation slice
                         seg = seg.strip()
-                        seg = re.sub(r"\s+", " ", seg)
+                        seg = _RE_WS.sub(" ", seg)
                         name = seg[-120:]
                 candidate_items.append({"doc": name or "Candidate", "score": sc})
         except Exception:
@@ -1224,9 +1931,8 @@ def _run_pre_evidence_in_thread(
     try:
         # Phase start
         try:
-            q.put(
-                {"type": "phase", "data": {"phase": "retrieval", "status": "start"}},
-                timeout=0.1,
+            q.put_nowait(
+                {"type": "phase", "data": {"phase": "retrieval", "status": "start"}}
             )
         except Exception:
             pass
@@ -1237,7 +1943,7 @@ def _run_pre_evidence_in_thread(
         elapsed = time.time() - t0
         # Emit simple metrics (contexts selected)
         try:
-            q.put(
+            q.put_nowait(
                 {
                     "type": "metric",
                     "data": {
@@ -1246,8 +1952,7 @@ def _run_pre_evidence_in_thread(
                         ),
                         "elapsed_s": elapsed,
                     },
-                },
-                timeout=0.1,
+                }
             )
         except Exception:
             pass
@@ -1282,6 +1987,7 @@ def _run_pre_evidence_in_thread(
                 }
             )
             app_state["session_data"] = sess
+            app_state["export_cache"].clear()
         except Exception:
             pass
         # Selection stats for transparency
@@ -1312,7 +2018,7 @@ def _run_pre_evidence_in_thread(
             score_min = min(scores) if scores else None
             score_max = max(scores) if scores else None
             score_mean = (sum(scores) / len(scores)) if scores else None
-            q.put(
+            q.put_nowait(
                 {
                     "type": "stats",
                     "data": {
@@ -1321,12 +2027,11 @@ def _run_pre_evidence_in_thread(
                         "score_max": score_max,
                         "per_doc": per_doc,
                     },
-                },
-                timeout=0.1,
+                }
             )
             try:
                 mmr_items.sort(key=lambda x: (-(x.get("score") or -1e9)))
-                q.put({"type": "mmr", "data": {"items": mmr_items}}, timeout=0.1)
+                q.put_nowait({"type": "mmr", "data": {"items": mmr_items}})
             except Exception:
                 pass
             # Emit candidate items if any were parsed from logs
@@ -1348,16 +2053,14 @@ def _run_pre_evidence_in_thread(
                                 ),
                             }
                         )
-                    q.put(
-                        {"type": "mmr_candidates", "data": {"items": norm}}, timeout=0.1
-                    )
+                    q.put_nowait({"type": "mmr_candidates", "data": {"items": norm}})
             except Exception:
                 pass
         except Exception:
             pass
         # Phase end
         try:
-            q.put(
+            q.put_nowait(
                 {
                     "type": "phase",
                     "data": {
@@ -1365,18 +2068,126 @@ def _run_pre_evidence_in_thread(
                         "status": "end",
                         "elapsed_s": elapsed,
                     },
-                },
-                timeout=0.1,
+                }
             )
         except Exception:
             pass
     except Exception as e:
         try:
-            q.put({"type": "log", "data": f"Error during pre-evidence: {e}"})
+            q.put_nowait({"type": "log", "data": f"Error during pre-evidence: {e}"})
         except Exception:
             pass
 
 
+def _bucket_scores(
+    scores: Tuple[float, ...], smin: float, smax: float, bins: int
+) -> List[int]:
+    """Count scores into `bins` uniform buckets over [smin, smax] in one pass."""
+    counts = [0] * bins
+    scale = (bins - 1) / (smax - smin)
+    top = bins - 1
+    for s in scores:
+        idx = int((s - smin) * scale + 1e-9)
+        counts[0 if idx < 0 else top if idx > top else idx] += 1
+    return counts
+
+
+# Compact histogram SVG skeletons shared by the progress and intel panels
+_SVG_TMPL = (
+    "<svg width='{w}' height='{h}' viewBox='0 0 {w} {h}' "
+    "xmlns='http://www.w3.org/2000/svg'>{body}</svg>"
+)
+_SVG_AXIS_TMPL = (
+    "<text x='%d' y='%d' font-size='9' fill='#9ca3af'>%s</text>"
+    "<text x='%d' y='%d' font-size='9' fill='#9ca3af' text-anchor='end'>%s</text>"
+)
+# Candidate and selected rects for one score bin
+_SCORE_BAR_TMPL = (
+    "<rect x='%d' y='%d' width='%d' height='%d' fill='#93c5fd' />"
+    "<rect x='%d' y='%d' width='%d' height='%d' fill='#3b82f6' />"
+)
+_YEAR_BAR_TMPL = "<rect x='%d' y='%d' width='%d' height='%d' fill='#10b981' />"
+
+
+def _sentence_spans(text: str) -> Generator[Tuple[int, int], None, None]:
+    """Yield (start, end) offsets of the sentences `_RE_SENT_SPLIT` would split out."""
+    start = 0
+    for sep in _RE_SENT_SPLIT.finditer(text):
+        yield start, sep.start()
+        start = sep.end()
+    yield start, len(text)
+
+
+def _li_items(items: Iterable[str]) -> str:
+    """Wrap pre-rendered items as consecutive <li> elements in one join."""
+    return "<li>" + "</li><li>".join(items) + "</li>"
+
+
+@functools.lru_cache(maxsize=2048)
+def _esc(s: str) -> str:
+    """Memoized html.escape for strings that recur across renders (doc names, queries)."""
+    return html.escape(s)
+
+
+@functools.lru_cache(maxsize=16)
+def _score_histogram_svg(
+    cand_scores: Tuple[float, ...], sel_scores: Tuple[float, ...]
+) -> str:
+    """Candidate/selected score overlay histogram SVG, memoized on the scores."""
+    all_scores = cand_scores + sel_scores
+    smin = min(all_scores)
+    smax = max(all_scores)
+    bins = 10
+    if smax <= smin:
+        smax = smin + 1e-6
+    width, height, pad = 320, 64, 4
+    bucket_c = _bucket_scores(cand_scores, smin, smax, bins)
+    bucket_s = _bucket_scores(sel_scores, smin, smax, bins)
+    maxc = max(max(bucket_c), max(bucket_s))
+    bw = (width - 2 * pad) / bins
+    bw_i = max(1, int(bw - 1))
+    scale = (height - 2 * pad) / maxc if maxc else 0.0
+    bars: List[str] = []
+    for i in range(bins):
+        c1 = bucket_c[i]
+        c2 = bucket_s[i]
+        # The epsilon keeps full-height bars from truncating a pixel short
+        bh1 = int(c1 * scale + 1e-9)
+        bh2 = int(c2 * scale + 1e-9)
+        xpos = int(pad + i * bw)
+        bars.append(
+            _SCORE_BAR_TMPL
+            % (xpos, height - pad - bh1, bw_i, bh1, xpos, height - pad - bh2, bw_i, bh2)
+        )
+    bars.append(
+        _SVG_AXIS_TMPL
+        % (pad, height - 2, f"{smin:.2f}", width - pad - 20, height - 2, f"{smax:.2f}")
+    )
+    return _SVG_TMPL.format(w=width, h=height, body="".join(bars))
+
+
+@functools.lru_cache(maxsize=16)
+def _per_doc_bars_html(counts: Tuple[Tuple[str, int], ...]) -> str:
+    """Top-5 evidence-by-document bar panel; memoized on the per-doc counts.
+
+    Doc names must already be HTML-escaped.
+    """
+    maxcnt = max(cnt for _, cnt in counts)
+    bars_items: List[str] = []
+    for name, cnt in heapq.nlargest(5, counts, key=itemgetter(1)):
+        pct = int(round((cnt / maxcnt) * 100)) if maxcnt > 0 else 0
+        bars_items.append(
+            f"<div style='margin:4px 0'><small>{name}</small>"
+            f"<div class='pqa-subtle' style='height:8px;border-radius:6px;overflow:hidden'><div style='height:100%;width:{pct}%;background:#3b82f6'></div></div>"
+            f"<small class='pqa-muted'>{cnt}</small></div>"
+        )
+    return (
+        "<div class='pqa-panel' style='margin-top:8px'><strong>Evidence by document</strong>"
+        + "".join(bars_items)
+        + "</div>"
+    )
+
+
 def _format_log_line(log_line: str) -> str:
     """Format a log line, handling JSON content specially."""
     try:
@@ -1416,37 +2227,69 @@ def stream_analysis_progress(
 ) -> Generator[str, None, None]:
     """Stream live analysis progress (pre-evidence) into an HTML panel."""
     # Initialize queue and settings/docs
-    q: Queue = Queue(maxsize=1000)
+    q: SimpleQueue = SimpleQueue()
     app_state["analysis_queue"] = q
 
     # Ensure settings and docs
     settings: Settings = app_state.get("settings") or initialize_settings(config_name)
     app_state["settings"] = settings
 
-    if app_state.get("docs") is None:
-        app_state["docs"] = Docs()
+    docs = app_state.get("docs")
+    if docs is None:
+        docs = app_state["docs"] = Docs()
         _ensure_query_loop()
         qloop = app_state["query_loop"]
-        for d in app_state.get("uploaded_docs", []):
+        # Ingest all uploaded docs concurrently on the query loop; the gather is
+        # built inside a coroutine there, since this Gradio thread has no loop
+        embedder = _cached_embedding_model(settings)
+        uploads = list(app_state.get("uploaded_docs", []))
+
+        async def _add_all() -> List[Any]:
+            return await asyncio.gather(
+                *(
+                    docs.aadd(d["path"], settings=settings, embedding_model=embedder)
+                    for d in uploads
+                ),
+                return_exceptions=True,
+            )
+
+        if uploads:
+            fut = asyncio.run_coroutine_threadsafe(_add_all(), qloop)
             try:
-                fut = asyncio.run_coroutine_threadsafe(
-                    app_state["docs"].aadd(d["path"], settings=settings), qloop
+                # Best-effort add; per-doc failures are returned, not raised
+                for d, res in zip(uploads, fut.result(timeout=_DOCS_REBUILD_TIMEOUT_S)):
+                    if isinstance(res, BaseException):
+                        logger.warning(
+                            f"Skipping doc that failed to add: {d.get('filename')}: {res}"
+                        )
+            except Exception as e:
+                # Stop the gather so it cannot keep filling the discarded Docs
+                fut.cancel()
+                logger.error(f"Failed to rebuild Docs corpus: {e}")
+                # Leave it unset so the next question retries the rebuild
+                app_state["docs"] = None
+                yield (
+                    "<div style='color:#b00'>Failed to rebuild the document index: "
+                    f"{html.escape(str(e) or type(e).__name__)}</div>"
                 )
-                # Best-effort add; ignore failures/timeouts
-                try:
-                    fut.result(timeout=300)
-                except Exception:
-                    pass
-            except Exception:
-                pass
+                return
 
-    # Kick off background thread
-    worker = threading.Thread(
-        target=_run_pre_evidence_in_thread,
-        args=(question, settings, app_state["docs"], q),
-        daemon=True,
-    )
-    worker.start()
+    # Kick off background worker on the shared pool. Idle refreshes come from a
+    # heartbeat thread feeding the same queue; both stop once the worker's future
+    # resolves, which also pushes the None sentinel that ends the stream loop.
+    stop_heartbeat = threading.Event()
+
+    def _heartbeat() -> None:
+        while not stop_heartbeat.wait(_HEARTBEAT_INTERVAL_S):
+            q.put_nowait({"type": "heartbeat"})
+
+    def _on_worker_done(_f: Any) -> None:
+        stop_heartbeat.set()
+        q.put_nowait(None)
+
+    worker = _EXECUTOR.submit(_run_pre_evidence_in_thread, question, settings, docs, q)
+    worker.add_done_callback(_on_worker_done)
+    threading.Thread(target=_heartbeat, name="pqa-heartbeat", daemon=True).start()
 
     # Initial UI shell
     start_ts = time.time()
@@ -1460,11 +2303,15 @@ def stream_analysis_progress(
     score_min: float | None = None
     score_mean: float | None = None
     score_max: float | None = None
-    per_doc_counts: Dict[str, int] = {}
+    per_doc_counts: Dict[str, int] = {}  # keyed by HTML-escaped doc name
     mmr_items_state: List[
         Dict[str, Any]
     ] = []  # [{'doc': str, 'score': Optional[float]}]
     mmr_candidates_state: List[Dict[str, Any]] = []
+    # Derived once per mmr/mmr_candidates event rather than on every render
+    mmr_sel_scores: Tuple[float, ...] = ()
+    mmr_sel_unique_docs = 0
+    mmr_cand_scores: Tuple[float, ...] = ()
     embed_latency_s: float | None = None
     # Answer-phase metrics
     answer_elapsed_s: float | None = None
@@ -1472,77 +2319,63 @@ def stream_analysis_progress(
     answer_prompt_chars: int | None = None
     answer_attempts: int | None = None
     # Phase flags - only tracking retrieval_done now since chevrons were removed
-    # Controls snapshot
-    try:
-        cutoff = getattr(
-            getattr(app_state["settings"], "answer", object()),
-            "evidence_relevance_score_cutoff",
-            None,
-        )
-    except Exception:
-        cutoff = None
-    try:
-        get_if_none = bool(
-            getattr(
-                getattr(app_state["settings"], "answer", object()),
-                "get_evidence_if_no_contexts",
-                False,
-            )
-        )
-    except Exception:
-        get_if_none = False
-    try:
-        group_by_q = bool(
-            getattr(
-                getattr(app_state["settings"], "answer", object()),
-                "group_contexts_by_question",
-                False,
-            )
-        )
-    except Exception:
-        group_by_q = False
-    try:
-        filter_extra_bg = bool(
-            getattr(
-                getattr(app_state["settings"], "answer", object()),
-                "answer_filter_extra_background",
-                False,
-            )
-        )
-    except Exception:
-        filter_extra_bg = False
-    try:
-        max_sources = int(
-            getattr(
-                getattr(app_state["settings"], "answer", object()),
-                "answer_max_sources",
-                10,
-            )
-        )
-    except Exception:
-        max_sources = 10
-    try:
-        max_attempts = int(
-            getattr(
-                getattr(app_state["settings"], "answer", object()),
-                "max_answer_attempts",
-                1,
-            )
-        )
-    except Exception:
-        max_attempts = 1
-    try:
-        ev_k = int(
-            getattr(
-                getattr(app_state["settings"], "answer", object()), "evidence_k", 15
+    # Controls snapshot (single lookup of settings.answer)
+    ans = getattr(app_state["settings"], "answer", None)
+    cutoff: Any = None
+    get_if_none = group_by_q = filter_extra_bg = False
+    max_sources, max_attempts, ev_k = 10, 1, 15
+    if ans is not None:
+        try:
+            cutoff = getattr(ans, "evidence_relevance_score_cutoff", None)
+            get_if_none = bool(getattr(ans, "get_evidence_if_no_contexts", False))
+            group_by_q = bool(getattr(ans, "group_contexts_by_question", False))
+            filter_extra_bg = bool(
+                getattr(ans, "answer_filter_extra_background", False)
             )
-        )
-    except Exception:
-        ev_k = 15
+            max_sources = int(getattr(ans, "answer_max_sources", 10))
+            max_attempts = int(getattr(ans, "max_answer_attempts", 1))
+            ev_k = int(getattr(ans, "evidence_k", 15))
+        except Exception:
+            pass
+    # Numeric cutoff for the filtered-contexts count on stats events
+    cutoff_val = float(cutoff) if isinstance(cutoff, (int, float)) else 0.0
+    # Filters line is invariant while streaming; rebuild only if rewrite_info is replaced
+    rewrite_info_id = id(app_state.get("rewrite_info"))
+    filters_html = _render_filters_inline(app_state.get("rewrite_info"))
+    # Region caches: the log tail is versioned by len(logs) (append-only) and the
+    # per-doc counts line by the dict object, which stats events replace wholesale
+    logs_html_n = -1
+    logs_html = ""
+    per_doc_src: Dict[str, int] | None = None
+    per_doc_html = ""
 
     def render_html() -> str:
+        nonlocal rewrite_info_id, filters_html
+        nonlocal logs_html_n, logs_html, per_doc_src, per_doc_html
         elapsed = time.time() - start_ts
-        running = worker.is_alive()
+        ri = app_state.get("rewrite_info")
+        if id(ri) != rewrite_info_id:
+            rewrite_info_id = id(ri)
+            filters_html = _render_filters_inline(ri)
+        if len(logs) != logs_html_n:
+            logs_html_n = len(logs)
+            logs_html = "".join([_format_log_line(ln) for ln in logs[-8:]])
+        if per_doc_counts is not per_doc_src:
+            per_doc_src = per_doc_counts
+            per_doc_html = (
+                "<li><small>Per‑doc counts: "
+                + ", ".join(
+                    [
+                        f"{name}={count}"
+                        for name, count in list(per_doc_counts.items())[:5]
+                    ]
+                )
+                + (" …" if len(per_doc_counts) > 5 else "")
+                + "</small></li>"
+                if per_doc_counts
+                else ""
+            )
+        running = not worker.done()
         # Keep last log locally if needed later; suppress unused var warning
         _last_log = logs[-1] if logs else ""
         # Clamp progress percent 0..100
@@ -1551,7 +2384,6 @@ def stream_analysis_progress(
             pct = int(max(0, min(100, round((contexts_selected / ev_k) * 100))))
         parts = [
             "<div class='pqa-panel' style='min-height:240px'>",
-            "<style>@keyframes pqa-spin{0%{transform:rotate(0deg)}100%{transform:rotate(360deg)}} .pqa-spinner{display:inline-block;width:14px;height:14px;border:2px solid #9ca3af;border-top-color:#3b82f6;border-radius:50%;animation:pqa-spin 0.8s linear infinite;margin-right:6px}</style>",
             (
                 "<div style='display:flex;align-items:center;gap:6px'>"
                 + ("<span class='pqa-spinner'></span>" if running else "")
@@ -1561,16 +2393,16 @@ def stream_analysis_progress(
             (
                 "<div class='pqa-subtle' style='margin:6px 0'>"
                 + (
-                    f"<small class='pqa-muted'>Rewritten from: {html.escape(original_question)}</small>"
+                    f"<small class='pqa-muted'>Rewritten from: {_esc(original_question)}</small>"
                     if original_question
                     else ""
                 )
                 + (
-                    f"<div><small><strong>Rewritten query</strong>: {html.escape(question)}</small></div>"
+                    f"<div><small><strong>Rewritten query</strong>: {_esc(question)}</small></div>"
                     if original_question
                     else ""
                 )
-                + _render_filters_inline(app_state.get("rewrite_info"))
+                + filters_html
                 + "</div>"
             ),
             (
@@ -1586,7 +2418,7 @@ def stream_analysis_progress(
                 )
             ),
             "<div class='pqa-subtle' style='max-height:120px;overflow:auto'>",
-            *[_format_log_line(ln) for ln in logs[-8:]],
+            logs_html,
             "</div>",
             # Transparency block
             "<div class='pqa-panel' style='margin-top:8px'>",
@@ -1619,19 +2451,7 @@ def stream_analysis_progress(
                 )
                 + "</small></li>"
             ),
-            (
-                "<li><small>Per‑doc counts: "
-                + ", ".join(
-                    [
-                        f"{html.escape(name)}={count}"
-                        for name, count in list(per_doc_counts.items())[:5]
-                    ]
-                )
-                + (" …" if len(per_doc_counts) > 5 else "")
-                + "</small></li>"
-                if per_doc_counts
-                else ""
-            ),
+            per_doc_html,
             # Summaries
             (
                 f"<li><small>Summaries synthesis: enabled={group_by_q or filter_extra_bg}, metrics=N/A</small></li>"
@@ -1707,74 +2527,16 @@ def stream_analysis_progress(
         if mmr_items_state or mmr_candidates_state:
             try:
                 # Selected summary
-                sel_scores = [
-                    float(x["score"])
-                    for x in mmr_items_state
-                    if isinstance(x.get("score"), (int, float))
-                ]
-                sel_unique_docs = len(
-                    {str(x.get("doc", "Unknown")) for x in mmr_items_state}
-                )
+                sel_unique_docs = mmr_sel_unique_docs
                 sel_total = len(mmr_items_state)
                 sel_div_share = (sel_unique_docs / sel_total) if sel_total > 0 else 0.0
                 # Candidate summary
-                cand_scores = []
-                for x in mmr_candidates_state:
-                    sv = x.get("score")
-                    if isinstance(sv, (int, float)):
-                        cand_scores.append(float(sv))
                 cand_total = len(mmr_candidates_state)
 
                 # Overlay histogram (candidates in light blue, selected in blue)
                 hist_svg = ""
-                if cand_scores or sel_scores:
-                    smin = min((cand_scores + sel_scores) or [0.0])
-                    smax = max((cand_scores + sel_scores) or [1.0])
-                    bins = 10
-                    if smax <= smin:
-                        smax = smin + 1e-6
-                    width, height, pad = 320, 64, 4
-                    bucket_c = [0] * bins
-                    bucket_s = [0] * bins
-                    for s in cand_scores:
-                        idx = int((s - smin) / (smax - smin) * (bins - 1) + 1e-9)
-                        idx = max(0, min(bins - 1, idx))
-                        bucket_c[idx] += 1
-                    for s in sel_scores:
-                        idx = int((s - smin) / (smax - smin) * (bins - 1) + 1e-9)
-                        idx = max(0, min(bins - 1, idx))
-                        bucket_s[idx] += 1
-                    maxc = max(bucket_c + bucket_s) if (bucket_c or bucket_s) else 1
-                    bw = (width - 2 * pad) / bins
-                    bars: List[str] = []
-                    for i in range(bins):
-                        c1 = bucket_c[i]
-                        c2 = bucket_s[i]
-                        bh1 = (
-                            0 if maxc == 0 else int(((c1 / maxc) * (height - 2 * pad)))
-                        )
-                        bh2 = (
-                            0 if maxc == 0 else int(((c2 / maxc) * (height - 2 * pad)))
-                        )
-                        xpos = int(pad + i * bw)
-                        y1 = height - pad - bh1
-                        y2 = height - pad - bh2
-                        bars.append(
-                            f"<rect x='{xpos}' y='{y1}' width='{max(1, int(bw - 1))}' height='{bh1}' fill='#93c5fd' />"
-                        )
-                        bars.append(
-                            f"<rect x='{xpos}' y='{y2}' width='{max(1, int(bw - 1))}' height='{bh2}' fill='#3b82f6' />"
-                        )
-                    axis = (
-                        f"<text x='{pad}' y='{height - 2}' font-size='9' fill='#9ca3af'>{smin:.2f}</text>"
-                        f"<text x='{width - pad - 20}' y='{height - 2}' font-size='9' fill='#9ca3af' text-anchor='end'>{smax:.2f}</text>"
-                    )
-                    hist_svg = (
-                        f"<svg width='{width}' height='{height}' viewBox='0 0 {width} {height}' xmlns='http://www.w3.org/2000/svg'>"
-                        + "".join(bars)
-                        + axis
-                        + "</svg>"
-                    )
+                if mmr_cand_scores or mmr_sel_scores:
+                    hist_svg = _score_histogram_svg(mmr_cand_scores, mmr_sel_scores)
                 parts.append("<div class='pqa-panel' style='margin-top:8px'>")
                 parts.append(
                     "<strong>MMR (Maximum Marginal Relevance) selection</strong>"
@@ -1790,22 +2552,7 @@ def stream_analysis_progress(
         # Compact per-doc bar visualization (top 5)
         if per_doc_counts:
             try:
-                maxcnt = max(per_doc_counts.values())
-                bars_items: List[str] = []
-                for name, cnt in sorted(per_doc_counts.items(), key=lambda x: -x[1])[
-                    :5
-                ]:
-                    pct = int(round((cnt / maxcnt) * 100)) if maxcnt > 0 else 0
-                    bars_items.append(
-                        f"<div style='margin:4px 0'><small>{html.escape(name)}</small>"
-                        f"<div class='pqa-subtle' style='height:8px;border-radius:6px;overflow:hidden'><div style='height:100%;width:{pct}%;background:#3b82f6'></div></div>"
-                        f"<small class='pqa-muted'>{cnt}</small></div>"
-                    )
-                parts.append(
-                    "<div class='pqa-panel' style='margin-top:8px'><strong>Evidence by document</strong>"
-                    + "".join(bars_items)
-                    + "</div>"
-                )
+                parts.append(_per_doc_bars_html(tuple(per_doc_counts.items())))
             except Exception:
                 pass
         # Omit Top evidence table here; it belongs in Research Intel
@@ -1814,25 +2561,22 @@ def stream_analysis_progress(
 
     # Stream loop
     yield render_html()
-    # Poll queue until thread completes and queue is drained
-    idle_cycles = 0
-    while worker.is_alive() or not q.empty():
-        try:
-            evt = q.get(timeout=0.5)
+    # Block on the queue until the worker's None sentinel arrives
+    try:
+        for evt in iter(q.get, None):
+            was_retrieval_done = retrieval_done
             if isinstance(evt, dict) and evt.get("type") == "log":
                 msg = str(evt.get("data", "")).strip()
                 logs.append(msg)
                 # Attempt to parse candidate_count and mmr_lambda from logs
                 try:
-                    m_c = re.search(r"candidates?\s*[:=]\s*(\d+)", msg, re.I)
+                    m_c = _RE_CANDIDATES.search(msg)
                     if m_c:
                         candidate_count = int(m_c.group(1))
                 except Exception:
                     pass
                 try:
-                    m_l = re.search(
-                        r"mmr[_\s-]*lambda\s*[:=]\s*([0-9]*\.?[0-9]+)", msg, re.I
-                    )
+                    m_l = _RE_MMR_LAMBDA.search(msg)
                     if m_l:
                         mmr_lambda = float(m_l.group(1))
                 except Exception:
@@ -1881,25 +2625,16 @@ def stream_analysis_progress(
                         score_max = float(smax)
                     pdoc = data.get("per_doc") or {}
                     if isinstance(pdoc, dict):
-                        # ensure str->int
+                        # ensure str->int; names are HTML-escaped once here
+                        # so the per-render views can interpolate them as-is
                         tmp: Dict[str, int] = {}
                         for k, v in pdoc.items():
                             try:
-                                tmp[str(k)] = int(v)
+                                tmp[html.escape(str(k))] = int(v)
                             except Exception:
                                 continue
                         per_doc_counts = tmp
                     # compute filtered contexts count using current cutoff, if scores present
-                    try:
-                        cutoff_val = float(
-                            getattr(
-                                getattr(app_state.get("settings"), "answer", object()),
-                                "evidence_relevance_score_cutoff",
-                                0.0,
-                            )
-                        )
-                    except Exception:
-                        cutoff_val = 0.0
                     scores_list = data.get("scores_list")
                     if isinstance(scores_list, list):
                         try:
@@ -1917,41 +2652,42 @@ def stream_analysis_progress(
                 data = evt.get("data", {}) or {}
                 items = data.get("items") or []
                 if isinstance(items, list):
-                    # Shallow copy to avoid mutation issues
+                    # Shallow copy to avoid mutation issues; collect the
+                    # histogram scores and distinct docs in the same pass
                     mmr_items_state = []
+                    sel_scores: List[float] = []
+                    sel_docs: set[str] = set()
                     for it in items:
                         try:
-                            mmr_items_state.append(
-                                {
-                                    "doc": str(it.get("doc", "Unknown")),
-                                    "score": (
-                                        float(it.get("score"))
-                                        if isinstance(it.get("score"), (int, float))
-                                        else None
-                                    ),
-                                }
-                            )
+                            doc_name = str(it.get("doc", "Unknown"))
+                            sv = it.get("score")
+                            sv = float(sv) if isinstance(sv, (int, float)) else None
+                            mmr_items_state.append({"doc": doc_name, "score": sv})
+                            sel_docs.add(doc_name)
+                            if sv is not None:
+                                sel_scores.append(sv)
                         except Exception:
                             continue
+                    mmr_sel_scores = tuple(sel_scores)
+                    mmr_sel_unique_docs = len(sel_docs)
             elif isinstance(evt, dict) and evt.get("type") == "mmr_candidates":
                 data = evt.get("data", {}) or {}
                 items = data.get("items") or []
                 if isinstance(items, list):
                     mmr_candidates_state = []
+                    cand_scores: List[float] = []
                     for it in items:
                         try:
+                            sv = it.get("score")
+                            sv = float(sv) if isinstance(sv, (int, float)) else None
                             mmr_candidates_state.append(
-                                {
-                                    "doc": str(it.get("doc", "Candidate")),
-                                    "score": (
-                                        float(it.get("score"))
-                                        if isinstance(it.get("score"), (int, float))
-                                        else None
-                                    ),
-                                }
+                                {"doc": str(it.get("doc", "Candidate")), "score": sv}
                             )
+                            if sv is not None:
+                                cand_scores.append(sv)
                         except Exception:
                             continue
+                    mmr_cand_scores = tuple(cand_scores)
             elif isinstance(evt, dict) and evt.get("type") == "answer_stats":
                 data = evt.get("data", {}) or {}
                 try:
@@ -1970,13 +2706,16 @@ def stream_analysis_progress(
                         answer_attempts = atts
                 except Exception:
                     pass
-            idle_cycles = 0
+            # Phase markers only matter to the panel when they end retrieval
+            if (
+                isinstance(evt, dict)
+                and evt.get("type") == "phase"
+                and retrieval_done == was_retrieval_done
+            ):
+                continue
             yield render_html()
-        except Empty:
-            idle_cycles += 1
-            # heartbeat UI refresh every ~2s
-            if idle_cycles % 4 == 0:
-                yield render_html()
+    finally:
+        stop_heartbeat.set()
     logs.append("Analysis complete.")
     yield render_html()
 
@@ -1989,134 +2728,139 @@ def format_answer_html(answer: str, contexts: List) -> str:
     return answer
 
 
-def format_sources_html(contexts: List) -> str:
-    """Format the sources as HTML."""
-    if not contexts:
-        return "<div class='pqa-subtle' style='text-align:center'><small class='pqa-muted'>No sources found.</small></div>"
+# html.escape's table as a single str.translate pass (used on per-row snippets)
+_HTML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
 
-    html_parts = [
-        "<div class='pqa-panel' style='max-height:300px; overflow-y:auto;'>",
-        "<h4>Evidence Sources:</h4>",
-    ]
 
-    for i, context in enumerate(contexts, 1):
-        try:
-            # Derive a robust citation/title
-            citation = None
-            title = None
-            page = getattr(context, "page", None)
-            score = getattr(context, "score", None)
-
-            if hasattr(context, "text"):
-                txt_obj = getattr(context, "text")
-                # Extract document-level citation info if available
-                doc = getattr(txt_obj, "doc", None)
-                if doc is not None:
-                    citation = getattr(doc, "formatted_citation", None)
-                    title = getattr(doc, "title", None) or getattr(doc, "docname", None)
-                # Extract underlying text string for snippet
-                if hasattr(txt_obj, "text"):
-                    text_str = getattr(txt_obj, "text") or ""
-                else:
-                    text_str = str(txt_obj)
-            else:
-                text_str = str(context)
-
-            # Fallbacks
-            display_name = (
-                citation
-                or title
-                or getattr(getattr(context, "text", object()), "name", None)
-                or f"Source {i}"
-            )
+def _clip(s: str, n: int) -> str:
+    """Truncate to n characters, marking the cut with "..."."""
+    return s[:n] + "..." if len(s) > n else s
+
+
+class ScoredChunk(NamedTuple):
+    """One evidence source normalized for the sources panel.
+
+    Missing pages and scores are stored as -1 so rendering needs no type checks;
+    ``display`` and ``snippet`` are already HTML-escaped.
+    """
+
+    display: str
+    score: float
+    page: int
+    snippet: str
+    venue: str
+
+
+def _scored_chunk(context: Any, i: int) -> ScoredChunk:
+    """Normalize a paper-qa context into a ScoredChunk (i numbers fallback names)."""
+    citation = None
+    title = None
+    venue = None
+    page = getattr(context, "page", None)
+    score = getattr(context, "score", None)
+    # Resolve the text/doc chain once and reuse it below
+    txt_obj = getattr(context, "text", None)
+    doc = getattr(txt_obj, "doc", None) if txt_obj is not None else None
+
+    if txt_obj is not None:
+        # Extract document-level citation info if available
+        if doc is not None:
+            citation = getattr(doc, "formatted_citation", None)
+            title = getattr(doc, "title", None) or getattr(doc, "docname", None)
             # Venue/reputation (when metadata available)
-            venue_bits = []
-            try:
-                venue = None
-                if hasattr(context, "text"):
-                    doc = getattr(getattr(context, "text", object()), "doc", None)
-                    if doc is not None:
-                        venue = getattr(doc, "venue", None) or getattr(
-                            doc, "journal", None
-                        )
-                if isinstance(venue, str) and venue.strip():
-                    venue_bits.append(venue.strip())
-            except Exception:
-                pass
-            snippet = text_str if isinstance(text_str, str) else str(text_str)
-            if len(snippet) > 200:
-                snippet = snippet[:200] + "..."
-
-            meta_bits = []
-            if isinstance(page, (int, float)):
-                meta_bits.append(f"p. {int(page)}")
-            if isinstance(score, (int, float)):
-                meta_bits.append(f"score={score:.3f}")
+            venue = getattr(doc, "venue", None) or getattr(doc, "journal", None)
+        # Extract underlying text string for snippet
+        if hasattr(txt_obj, "text"):
+            text_str = txt_obj.text or ""
+        else:
+            text_str = str(txt_obj)
+    else:
+        text_str = str(context)
+
+    snippet = text_str if isinstance(text_str, str) else str(text_str)
+    return ScoredChunk(
+        # Fallbacks
+        _esc(str(citation or title or getattr(txt_obj, "name", None) or f"Source {i}")),
+        float(score) if isinstance(score, (int, float)) else -1.0,
+        int(page) if isinstance(page, (int, float)) else -1,
+        # Clip first, then escape in one C-level pass over the short result
+        _clip(snippet, 200).translate(_HTML_ESCAPE),
+        venue.strip() if isinstance(venue, str) else "",
+    )
+
+
+# One evidence source in the sources panel: name, meta, venue line, flags, snippet
+_SOURCE_TMPL = (
+    "<div class='pqa-subtle' style='margin-bottom:10px; padding:10px; border-left: 3px solid #3b82f6;'>"
+    "<strong>%s</strong>%s<br>%s%s<small>%s</small></div>"
+)
+_SOURCE_VENUE_TMPL = "<small class='pqa-muted'>Venue: %s</small><br>"
+_SOURCE_FLAG_TMPL = "<span class='pqa-subtle' style='display:inline-block;padding:2px 6px;margin:2px;border-radius:10px'>%s</span>"
+_PREPRINT_MARKERS = ("arxiv", "biorxiv", "medrxiv", "preprint")
+
+
+def _source_html(context: Any, i: int, show_flags: bool) -> str:
+    """Render one context for format_sources_html (errors become a stub row)."""
+    try:
+        row = _scored_chunk(context, i)
+        meta_bits = []
+        if row.page >= 0:
+            meta_bits.append(f"p. {row.page}")
+        if row.score >= 0:
+            meta_bits.append(f"score={row.score:.3f}")
+        flags = ""
+        if show_flags:
             # Flags: preprint / possible retraction (heuristic)
-            flags_bits = []
-            try:
-                dn_low = (display_name or "").lower()
-                if any(
-                    k in dn_low for k in ["arxiv", "biorxiv", "medrxiv", "preprint"]
-                ):
-                    flags_bits.append("Preprint")
-                if "retract" in dn_low:
-                    flags_bits.append("Retracted?")
-            except Exception:
-                pass
-            meta = (
+            dn_low = (row.display or "").lower()
+            if any(k in dn_low for k in _PREPRINT_MARKERS):
+                flags += _SOURCE_FLAG_TMPL % "Preprint"
+            if "retract" in dn_low:
+                flags += _SOURCE_FLAG_TMPL % "Retracted?"
+        return _SOURCE_TMPL % (
+            row.display,
+            (
                 f" <small class='pqa-muted'>({' | '.join(meta_bits)})</small>"
                 if meta_bits
                 else ""
-            )
+            ),
+            _SOURCE_VENUE_TMPL % html.escape(row.venue) if row.venue else "",
+            flags,
+            row.snippet,
+        )
+    except Exception as e:
+        logger.warning(f"Error formatting context {i}: {e}")
+        return f"<div>Source {i}: [Error formatting source]</div>"
 
-            html_parts.append(
-                "<div class='pqa-subtle' style='margin-bottom:10px; padding:10px; border-left: 3px solid #3b82f6;'>"
-            )
-            html_parts.append(f"<strong>{display_name}</strong>{meta}<br>")
-            if venue_bits:
-                html_parts.append(
-                    f"<small class='pqa-muted'>Venue: {html.escape(', '.join(venue_bits))}</small><br>"
-                )
-            ui = app_state.get("ui_toggles", {}) or {}
-            show_flags = bool(ui.get("show_flags", True))
-            if flags_bits and show_flags:
-                html_parts.append(
-                    "".join(
-                        [
-                            f"<span class='pqa-subtle' style='display:inline-block;padding:2px 6px;margin:2px;border-radius:10px'>{html.escape(flag)}</span>"
-                            for flag in flags_bits
-                        ]
-                    )
-                )
-            html_parts.append(f"<small>{snippet}</small>")
-            html_parts.append("</div>")
-        except Exception as e:
-            logger.warning(f"Error formatting context {i}: {e}")
-            html_parts.append(f"<div>Source {i}: [Error formatting source]</div>")
 
-    html_parts.append("</div>")
-    return "".join(html_parts)
+def format_sources_html(contexts: List) -> str:
+    """Format the sources as HTML."""
+    if not contexts:
+        return "<div class='pqa-subtle' style='text-align:center'><small class='pqa-muted'>No sources found.</small></div>"
+
+    ui = app_state.get("ui_toggles", {}) or {}
+    show_flags = bool(ui.get("show_flags", True))
+    body = "".join(
+        _source_html(context, i, show_flags) for i, context in enumerate(contexts, 1)
+    )
+    return (
+        "<div class='pqa-panel' style='max-height:300px; overflow-y:auto;'>"
+        "<h4>Evidence Sources:</h4>" + body + "</div>"
+    )
 
 
 def format_metadata_html(metadata: dict) -> str:
     """Format metadata as HTML."""
-    html_parts = ["<div class='pqa-panel' style='font-size:0.9em;'>"]
-    html_parts.append("<h5>Processing Information</h5>")
-    html_parts.append(
+    return (
+        "<div class='pqa-panel' style='font-size:0.9em;'>"
+        "<h5>Processing Information</h5>"
         f"<strong>Processing Time:</strong> {metadata.get('processing_time', 0):.2f} seconds<br>"
-    )
-    html_parts.append(
         f"<strong>Documents Searched:</strong> {metadata.get('documents_searched', 0)}<br>"
-    )
-    html_parts.append(
         f"<strong>Evidence Sources:</strong> {metadata.get('evidence_sources', 0)}<br>"
-    )
-    html_parts.append(
         f"<strong>Confidence:</strong> {metadata.get('confidence', 0):.1%}"
+        "</div>"
     )
-    html_parts.append("</div>")
-    return "".join(html_parts)
 
 
 def build_evidence_summary_html(contexts: List) -> str:
@@ -2160,10 +2904,7 @@ def build_evidence_summary_html(contexts: List) -> str:
             except Exception:
                 continue
 
-        # Sort by score descending
-        scored_contexts.sort(key=lambda x: x[0], reverse=True)
-
-        # Build summary statistics
+        # Build summary statistics (order-independent, so no sort needed)
         total_evidence = len(contexts)
         avg_score = (
             sum(score for score, _, _ in scored_contexts) / total_evidence
@@ -2194,22 +2935,43 @@ def build_evidence_summary_html(contexts: List) -> str:
         return "<div class='pqa-panel'><h4>📊 Evidence Summary</h4><p>Evidence summary unavailable.</p></div>"
 
 
+# One Top Evidence card: rank, score, escaped excerpt, escaped source
+_TOP_EVIDENCE_ROW_TMPL = """
+            <div style='border: 1px solid #ddd; border-radius: 4px; padding: 8px; margin-bottom: 8px; background: #f9f9f9;'>
+                <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 4px;'>
+                    <small><strong>#%d</strong></small>
+                    <span style='background: #e3f2fd; padding: 2px 6px; border-radius: 3px; font-size: 0.8em;'>
+                        Score: %.3f
+                    </span>
+                </div>
+                <div style='font-size: 0.9em; margin-bottom: 4px;'>%s</div>
+                <div style='font-size: 0.8em; color: #666; font-style: italic;'>%s</div>
+            </div>
+            """
+
+
 def build_top_evidence_html(contexts: List) -> str:
     """Generate top evidence by relevance score for the Evidence tab."""
     try:
         if not contexts:
             return "<div class='pqa-panel'><h4>🏆 Top Evidence (by score)</h4><p>No evidence available.</p></div>"
 
-        # Sort contexts by relevance score if available
-        scored_contexts = []
-        for c in contexts:
+        def _score(c: Any) -> float:
             try:
                 # Try to get score from different possible attributes
-                score = (
+                return float(
                     getattr(c, "score", None)
                     or getattr(c, "relevance_score", None)
                     or 0.0
                 )
+            except Exception:
+                return 0.0
+
+        # Select the top 8 by score first (stable, like a full descending sort);
+        # only those need their text and source extracted
+        scored_contexts = []
+        for c in heapq.nlargest(8, contexts, key=_score):
+            try:
                 if hasattr(c, "text"):
                     text_obj = getattr(c, "text", None)
                     if text_obj and hasattr(text_obj, "text"):
@@ -2231,13 +2993,10 @@ def build_top_evidence_html(contexts: List) -> str:
                             or "Unknown source"
                         )
 
-                scored_contexts.append((score, text, doc_title))
+                scored_contexts.append((_score(c), text, doc_title))
             except Exception:
                 continue
 
-        # Sort by score descending
-        scored_contexts.sort(key=lambda x: x[0], reverse=True)
-
         # Build HTML
         parts = ["<div class='pqa-panel'>"]
         parts.append("<h4>🏆 Top Evidence (by score)</h4>")
@@ -2246,21 +3005,13 @@ def build_top_evidence_html(contexts: List) -> str:
             "<div style='max-height: 400px; overflow-y: auto; margin-top: 8px;'>"
         )
 
-        for i, (score, text, doc_title) in enumerate(scored_contexts[:8]):  # Show top 8
+        for i, (score, text, doc_title) in enumerate(scored_contexts):
             # Truncate text for display
-            display_text = text[:250] + "..." if len(text) > 250 else text
-            parts.append(f"""
-            <div style='border: 1px solid #ddd; border-radius: 4px; padding: 8px; margin-bottom: 8px; background: #f9f9f9;'>
-                <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 4px;'>
-                    <small><strong>#{i + 1}</strong></small>
-                    <span style='background: #e3f2fd; padding: 2px 6px; border-radius: 3px; font-size: 0.8em;'>
-                        Score: {score:.3f}
-                    </span>
-                </div>
-                <div style='font-size: 0.9em; margin-bottom: 4px;'>{html.escape(display_text)}</div>
-                <div style='font-size: 0.8em; color: #666; font-style: italic;'>{html.escape(doc_title)}</div>
-            </div>
-            """)
+            display_text = _clip(text, 250)
+            parts.append(
+                _TOP_EVIDENCE_ROW_TMPL
+                % (i + 1, score, html.escape(display_text), html.escape(doc_title))
+            )
 
         parts.append("</div>")
         parts.append("</div>")
@@ -2312,19 +3063,15 @@ def build_evidence_meta_summary_html(contexts: List, score_cutoff: float = 0.0)
 
                     # Extract venue (simple heuristic)
                     venue_text = citation + " " + title
-                    venue_patterns = [
-                        r"\b(Nature|Science|Cell|PNAS|NEJM|Lancet|BMJ|JAMA)\b",
-                        r"\b([A-Z][a-z]+ [A-Z][a-z]+)\b(?=\s*\d{4})",  # Journal Name YYYY pattern
-                    ]
-                    for pattern in venue_patterns:
-                        matches = re.findall(pattern, venue_text, re.IGNORECASE)
+                    for pattern in _VENUE_RES:
+                        matches = pattern.findall(venue_text)
                         venues.update(
                             match if isinstance(match, str) else match[0]
                             for match in matches
                         )
 
                     # Extract year
-                    year_match = re.search(r"\b(20\d{2}|19\d{2})\b", venue_text)
+                    year_match = _RE_YEAR.search(venue_text)
                     if year_match:
                         year = int(year_match.group(1))
                         if 1990 <= year <= 2025:
@@ -2355,18 +3102,18 @@ def build_evidence_meta_summary_html(contexts: List, score_cutoff: float = 0.0)
             year_counts: dict[int, int] = {}
             for y in years:
                 year_counts[y] = year_counts.get(y, 0) + 1
-            sorted_years = sorted(year_counts.keys())
-            if len(sorted_years) <= 5:
+            # Only a short list is shown in order; a long one needs just its ends
+            if len(year_counts) <= 5:
                 year_histogram = ", ".join(
-                    f"{y}({year_counts[y]})" for y in sorted_years
+                    f"{y}({year_counts[y]})" for y in sorted(year_counts)
                 )
             else:
                 year_histogram = (
-                    f"{min(sorted_years)}-{max(sorted_years)} ({len(sorted_years)} yrs)"
+                    f"{min(year_counts)}-{max(year_counts)} ({len(year_counts)} yrs)"
                 )
 
-        # Format venues list
-        venues_display = ", ".join(sorted(list(venues))[:3])
+        # Format venues list (first three alphabetically, without sorting them all)
+        venues_display = ", ".join(heapq.nsmallest(3, venues))
         if len(venues) > 3:
             venues_display += f" +{len(venues) - 3} more"
 
@@ -2402,16 +3149,14 @@ def build_conflicts_html(answer: str, contexts: List) -> str:
         claim_map: Dict[str, List[Tuple[str, str, str]]] = {}
 
         def _extract_year(s: str) -> int | None:
-            m = re.search(r"\b(19|20)\d{2}\b", s)
+            m = _RE_YEAR.search(s)
             return int(m.group(0)) if m else None
 
-        def _is_preprint(s: str) -> bool:
-            return any(
-                k in s.lower() for k in ["arxiv", "biorxiv", "medrxiv", "preprint"]
-            )
+        def _is_preprint(s_low: str) -> bool:
+            return any(k in s_low for k in ["arxiv", "biorxiv", "medrxiv", "preprint"])
 
-        def _is_retracted(s: str) -> bool:
-            return "retract" in s.lower()
+        def _is_retracted(s_low: str) -> bool:
+            return "retract" in s_low
 
         for c in contexts or []:
             try:
@@ -2444,9 +3189,10 @@ def build_conflicts_html(answer: str, contexts: List) -> str:
                         doc_years[doc_title] = y
 
                 flags: List[str] = []
-                if _is_retracted(doc_title):
+                title_low = doc_title.lower()
+                if _is_retracted(title_low):
                     flags.append("Retracted?")
-                if _is_preprint(doc_title):
+                if _is_preprint(title_low):
                     flags.append("Preprint")
                 if flags:
                     doc_flags[doc_title] = list(
@@ -2466,9 +3212,11 @@ def build_conflicts_html(answer: str, contexts: List) -> str:
             ("effective", "ineffective"),
         ]
 
+        # Texts are already lowercased; join each doc once for all pair scans
+        joined = [(d, "\n".join(txts)) for d, txts in by_doc.items()]
         for pos, neg in antonym_pairs:
-            pos_docs = [d for d, txts in by_doc.items() if any(pos in t for t in txts)]
-            neg_docs = [d for d, txts in by_doc.items() if any(neg in t for t in txts)]
+            pos_docs = [d for d, text in joined if pos in text]
+            neg_docs = [d for d, text in joined if neg in text]
             if pos_docs and neg_docs and not set(pos_docs).intersection(neg_docs):
                 conflict_items.append(
                     f"Conflicting findings on '{pos}' vs '{neg}' across sources"
@@ -2481,9 +3229,7 @@ def build_conflicts_html(answer: str, contexts: List) -> str:
             if bool(ui.get("show_conflicts", True)):
                 for entity, items in list(claim_map.items())[:6]:
                     docs_for_entity = list({d for _p, _v, d in items})
-                    docs_display = ", ".join(
-                        [html.escape(d) for d in docs_for_entity[:4]]
-                    )
+                    docs_display = ", ".join([_esc(d) for d in docs_for_entity[:4]])
                     conflicts_ui.append(
                         f"<li><small><strong>{html.escape(entity)}</strong>: {len(docs_for_entity)} source(s) [{docs_display}{' …' if len(docs_for_entity) > 4 else ''}]</small></li>"
                     )
@@ -2497,7 +3243,7 @@ def build_conflicts_html(answer: str, contexts: List) -> str:
         # Potential contradictions
         parts.append("<div><strong>Potential contradictions</strong><ul>")
         if conflict_items:
-            parts.extend([f"<li>{x}</li>" for x in conflict_items[:8]])
+            parts.append(_li_items(conflict_items[:8]))
         else:
             parts.append("<li>No explicit contradictions detected across sources.</li>")
         parts.append("</ul></div>")
@@ -2530,7 +3276,7 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
 
         def _extract_year(s: str) -> int | None:
             try:
-                m = re.search(r"\b(20\d{2}|19\d{2})\b", s)
+                m = _RE_YEAR.search(s)
                 if m:
                     y = int(m.group(1))
                     if 1900 <= y <= 2100:
@@ -2539,18 +3285,16 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
                 return None
             return None
 
-        def _is_preprint(s: str) -> bool:
-            s_low = s.lower()
-            return any(
-                k in s_low for k in ["arxiv", "biorxiv", "medrxiv", "preprint"]
-            )  # heuristic
+        def _is_preprint(s_low: str) -> bool:
+            return any(k in s_low for k in _PREPRINT_MARKERS)  # heuristic
 
-        def _is_retracted(s: str) -> bool:
-            return "retract" in s.lower()
+        def _is_retracted(s_low: str) -> bool:
+            return "retract" in s_low
 
         for c in contexts or []:
             try:
-                doc = getattr(getattr(c, "text", object()), "doc", None)
+                txt_obj = getattr(c, "text", None)
+                doc = getattr(txt_obj, "doc", None) if txt_obj is not None else None
                 doc_title = None
                 if doc is not None:
                     doc_title = (
@@ -2560,14 +3304,11 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
                     )
                 if not doc_title:
                     doc_title = "Unknown source"
-                txt = ""
-                if hasattr(c, "text"):
-                    t = getattr(c.text, "text", None)
-                    txt = (
-                        t
-                        if isinstance(t, str)
-                        else (str(c.text) if c.text is not None else "")
-                    )
+                if txt_obj is not None:
+                    t = getattr(txt_obj, "text", None)
+                    txt = t if isinstance(t, str) else str(txt_obj)
+                elif hasattr(c, "text"):
+                    txt = ""
                 else:
                     txt = str(c)
                 by_doc.setdefault(doc_title, []).append(txt.lower())
@@ -2582,9 +3323,10 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
                         doc_years[doc_title] = y
                 # Flags
                 flags: List[str] = []
-                if _is_retracted(doc_title):
+                title_low = doc_title.lower()
+                if _is_retracted(title_low):
                     flags.append("Retracted?")
-                if _is_preprint(doc_title):
+                if _is_preprint(title_low):
                     flags.append("Preprint")
                 if flags:
                     doc_flags[doc_title] = list(
@@ -2594,90 +3336,75 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
                 continue
 
         # Detect contradictions by antonym pairs and simple polarity clustering across docs
-        antonym_pairs = [
-            ("increase", "decrease"),
-            ("higher", "lower"),
-            ("improves", "worsens"),
-            ("upregulated", "downregulated"),
-            ("promotes", "inhibits"),
-            ("protective", "risk"),
-        ]
         conflict_items = []
         # Quick claim extractor: (entity_key, polarity, doc_title)
         claim_map: Dict[str, List[Tuple[int, str, str]]] = {}
-        verb_to_pol = {
-            "increase": 1,
-            "increases": 1,
-            "increased": 1,
-            "higher": 1,
-            "upregulate": 1,
-            "upregulated": 1,
-            "upregulation": 1,
-            "promote": 1,
-            "promotes": 1,
-            "improve": 1,
-            "improves": 1,
-            "decrease": -1,
-            "decreases": -1,
-            "decreased": -1,
-            "lower": -1,
-            "downregulate": -1,
-            "downregulated": -1,
-            "downregulation": -1,
-            "inhibit": -1,
-            "inhibits": -1,
-            "worsen": -1,
-            "worsens": -1,
-        }
-        negations = ["no ", "not ", "does not ", "lack of ", "without "]
-        docs_list = list(by_doc.items())
-        for i in range(len(docs_list)):
-            doc_a, texts_a = docs_list[i]
-            text_a = "\n".join(texts_a)
-            for j in range(i + 1, len(docs_list)):
-                doc_b, texts_b = docs_list[j]
-                text_b = "\n".join(texts_b)
-                for w1, w2 in antonym_pairs:
-                    if w1 in text_a and w2 in text_b:
-                        conflict_items.append(
-                            f"{doc_a} mentions '{w1}', while {doc_b} mentions '{w2}'."
-                        )
-                    if w2 in text_a and w1 in text_b:
-                        conflict_items.append(
-                            f"{doc_a} mentions '{w2}', while {doc_b} mentions '{w1}'."
-                        )
+        # One scan per doc packs the antonym words it contains into a bitmask;
+        # each pair then only pairs up the docs holding either side. Cross-source
+        # contradictions need two sources, so a single-doc corpus skips the scan
+        doc_names = [_esc(d) for d in by_doc]
+        masks = []
+        if len(by_doc) >= 2:
+            for texts in by_doc.values():
+                mask = 0
+                for m in _ANTONYM_RE.finditer("\n".join(texts)):
+                    mask |= _ANTONYM_BITS[m.group(1)]
+                masks.append(mask)
+        # (doc a, doc b, pair, side, message): sorted below into doc-pair order so the
+        # visible top 8 match a walk over every (a, b) doc pair
+        antonym_hits: List[Tuple[int, int, int, int, str]] = []
+        for k, (w1, w2) in enumerate(_ANTONYM_PAIRS):
+            b1, b2 = _ANTONYM_BITS[w1], _ANTONYM_BITS[w2]
+            has_w1 = [i for i, mask in enumerate(masks) if mask & b1]
+            if not has_w1:
+                continue
+            has_w2 = [j for j, mask in enumerate(masks) if mask & b2]
+            for i in has_w1:
+                for j in has_w2:
+                    # Name the earlier source first, as in a doc-pair walk
+                    if i < j:
+                        msg = f"{doc_names[i]} mentions '{w1}', while {doc_names[j]} mentions '{w2}'."
+                        antonym_hits.append((i, j, k, 0, msg))
+                    elif j < i:
+                        msg = f"{doc_names[j]} mentions '{w2}', while {doc_names[i]} mentions '{w1}'."
+                        antonym_hits.append((j, i, k, 1, msg))
+        antonym_hits.sort()
+        conflict_items.extend(hit[4] for hit in antonym_hits)
 
         # Extract simple claims per sentence and cluster by entity phrase
         try:
             for doc_title, texts in by_doc.items():
                 for raw in texts:
-                    for sent in re.split(r"(?<=[.!?])\s+", raw):
-                        s = sent.strip()
-                        if not s:
-                            continue
-                        for verb, pol in verb_to_pol.items():
-                            if verb in s:
-                                inv = pol
-                                s_low = s.lower()
-                                if any(neg in s_low for neg in negations):
-                                    inv = -pol
-                                m = re.search(
-                                    rf"{verb}[^a-zA-Z0-9]+(?:(?:in|of|on|for|to)\s+)?([a-z0-9\-_/]+(?:\s+[a-z0-9\-_/]+){{0,4}})",
-                                    s_low,
-                                )
-                                entity = m.group(1) if m else s_low
-                                entity = re.sub(r"\s+", " ", entity).strip()
-                                entity = entity[:80]
-                                claim_map.setdefault(entity, []).append(
-                                    (inv, verb, doc_title)
+                    # Most chunks carry no claim verb at all; skip splitting them
+                    if _CLAIM_RE.search(raw) is None:
+                        continue
+                    # Scan sentence spans in place (pos/endpos) rather than
+                    # splitting the chunk into new sentence strings
+                    for start, end in _sentence_spans(raw):
+                        negated: bool | None = None
+                        for m in _CLAIM_RE.finditer(raw, start, end):
+                            if negated is None:
+                                negated = (
+                                    _NEGATION_RE.search(raw, start, end) is not None
                                 )
-                                break
+                            verb = m.group("verb")
+                            pol = _CLAIM_VERB_POLARITY[verb]
+                            entity = _RE_WS.sub(" ", m.group("entity")).strip()[:80]
+                            claim_map.setdefault(entity, []).append(
+                                (-pol if negated else pol, verb, doc_title)
+                            )
             contradiction_clusters: List[str] = []
             for entity, items in claim_map.items():
-                pols = {p for p, _v, _d in items}
-                if 1 in pols and -1 in pols:
+                has_pos = has_neg = False
+                docs_for_entity: set[str] = set()
+                for p, _v, d in items:
+                    if p == 1:
+                        has_pos = True
+                    elif p == -1:
+                        has_neg = True
+                    docs_for_entity.add(d)
+                if has_pos and has_neg:
                     # Mixed polarity across docs
-                    docs_for_entity = list({d for _p, _v, d in items})
                     contradiction_clusters.append(
                         f"{html.escape(entity)}: mixed polarity across {len(docs_for_entity)} sources"
                     )
@@ -2687,80 +3414,75 @@ def build_intelligence_html(answer: str, contexts: List) -> str:
         except Exception:
             pass
 
-        parts = [
-            "<div class='pqa-panel'>",
-            "<h4>Research Intel</h4>",
-            "<div><strong>Potential contradictions</strong><ul>",
-        ]
+        parts = [_INTEL_OPEN]
         if conflict_items:
-            parts.extend([f"<li>{x}</li>" for x in conflict_items[:8]])
+            parts.append(_li_items(conflict_items[:8]))
         else:
-            parts.append("<li>No explicit contradictions detected across sources.</li>")
-        parts.append("</ul></div>")
+            parts.append(_INTEL_NO_CONFLICTS)
+        parts.append(_INTEL_LIST_CLOSE)
 
         # Add scientist-relevant metrics: Quality flags and Recency/Diversity
         try:
-            # Quality flags
-            flagged = [(doc, flags) for doc, flags in doc_flags.items() if flags]
-            parts.append(
-                "<div style='margin-top:8px'><strong>Quality flags</strong><ul>"
-            )
+            # Quality flags; preprints are counted in the same pass
+            flagged = []
+            preprints = 0
+            for doc, flags in doc_flags.items():
+                if flags:
+                    flagged.append((doc, flags))
+                    if "Preprint" in flags:
+                        preprints += 1
+            parts.append(_INTEL_QFLAGS_OPEN)
             if flagged:
-                for doc, flags in flagged[:8]:
-                    parts.append(
-                        f"<li><small>{html.escape(doc)}: {', '.join(flags)}</small></li>"
+                parts.append(
+                    _li_items(
+                        f"<small>{_esc(doc)}: {', '.join(flags)}</small>"
+                        for doc, flags in flagged[:8]
                     )
+                )
             else:
-                parts.append("<li><small>No quality flags detected.</small></li>")
-            parts.append("</ul></div>")
+                parts.append(_INTEL_NO_QFLAGS)
+            parts.append(_INTEL_LIST_CLOSE)
 
             # Diversity & recency
-            years: List[int] = []
+            year_counts: Counter[int] = Counter()
             for y in doc_years.values():
                 try:
-                    years.append(int(y))
+                    year_counts[int(y)] += 1
                 except Exception:
                     continue
             unique_docs = len(by_doc)
-            preprints = sum(1 for f in doc_flags.values() if "Preprint" in f)
             preprint_share = (preprints / unique_docs) if unique_docs > 0 else 0.0
-            parts.append(
-                "<div style='margin-top:8px'><strong>Diversity & recency</strong>"
-            )
+            parts.append(_INTEL_DIVERSITY_OPEN)
             parts.append(
                 f"<div><small>Unique papers={unique_docs}, Preprint share={preprint_share:.0%}</small></div>"
             )
-            if years:
-                y_min = min(years)
-                y_max = max(years)
+            if year_counts:
+                y_min = min(year_counts)
+                y_max = max(year_counts)
                 # Year histogram (compact SVG)
-                year_counts: Dict[int, int] = {}
-                for y in years:
-                    year_counts[y] = year_counts.get(y, 0) + 1
-                ys_sorted = list(range(y_min, y_max + 1))
                 width, height, pad = 320, 64, 4
-                maxc = max(year_counts.values()) if year_counts else 1
-                bw = (width - 2 * pad) / max(1, len(ys_sorted))
-                bars = []
-                for i, y in enumerate(ys_sorted):
-                    c = year_counts.get(y, 0)
-                    bh = 0 if maxc == 0 else int(((c / maxc) * (height - 2 * pad)))
-                    x = pad + int(i * bw)
-                    ypix = height - pad - bh
+                maxc = max(year_counts.values())
+                bw = (width - 2 * pad) / (y_max - y_min + 1)
+                bw_i = max(1, int(bw - 1))
+                scale = (height - 2 * pad) / maxc if maxc else 0.0
+                # Empty years would be zero-height rects; emit populated years only
+                bar_fmt = _YEAR_BAR_TMPL.__mod__
+                base = height - pad
+                bars: List[str] = []
+                for y, c in sorted(year_counts.items()):
+                    bh = int(c * scale + 1e-9)
                     bars.append(
-                        f"<rect x='{x}' y='{ypix}' width='{max(1, int(bw - 1))}' height='{bh}' fill='#10b981' />"
+                        bar_fmt((pad + int((y - y_min) * bw), base - bh, bw_i, bh))
                     )
-                axis = (
-                    f"<text x='{pad}' y='{height - 2}' font-size='9' fill='#9ca3af'>{y_min}</text>"
-                    f"<text x='{width - pad - 20}' y='{height - 2}' font-size='9' fill='#9ca3af' text-anchor='end'>{y_max}</text>"
+                bars.append(
+                    _SVG_AXIS_TMPL
+                    % (pad, height - 2, y_min, width - pad - 20, height - 2, y_max)
                 )
-                svg = (
-                    f"<svg width='{width}' height='{height}' viewBox='0 0 {width} {height}' xmlns='http://www.w3.org/2000/svg'>"
-                    + "".join(bars)
-                    + axis
-                    + "</svg>"
+                parts.append(
+                    "<div style='margin-top:4px'>"
+                    + _SVG_TMPL.format(w=width, h=height, body="".join(bars))
+                    + "</div>"
                 )
-                parts.append("<div style='margin-top:4px'>" + svg + "</div>")
             parts.append("</div>")
         except Exception:
             pass
@@ -2781,8 +3503,7 @@ def build_critique_html(answer: str, contexts: List) -> str:
         if len(answer.split()) > 250:
             flags.append("Answer is long; consider tighter citation linkage.")
         # Simple unsupported claim heuristic: claim words without numbers/citations nearby
-        risky_terms = ["significant", "novel", "first", "proves", "causes"]
-        if any(t in answer.lower() for t in risky_terms):
+        if _has_risky(answer):
             flags.append(
                 "Contains strong language; verify claims against evidence excerpts."
             )
@@ -2795,7 +3516,7 @@ def build_critique_html(answer: str, contexts: List) -> str:
         return (
             "<div class='pqa-subtle' style='margin-top:6px'>"
             + "<ul>"
-            + "".join([f"<li><small>{html.escape(x)}</small></li>" for x in flags])
+            + "".join([f"<li><small>{_esc(x)}</small></li>" for x in flags])
             + "</ul>"
             + "</div>"
         )
@@ -2810,24 +3531,24 @@ def _render_markdown_inline(text: str) -> str:
     Other HTML is escaped for safety.
     """
     try:
-        s = html.escape(text)
-        # Links first
-        s = re.sub(
-            r"\[([^\]]+)\]\((https?://[^)\s]+)\)",
-            r"<a href=\"\\2\" target=\"_blank\" rel=\"noopener noreferrer\">\\1</a>",
-            s,
-        )
-        # Bold
-        s = re.sub(r"\*\*([^*]+)\*\*", r"<strong>\\1</strong>", s)
-        # Italic (avoid bold sequences)
-        s = re.sub(r"(?<!\*)\*([^*]+)\*(?!\*)", r"<em>\\1</em>", s)
-        # Inline code
-        s = re.sub(r"`([^`]+)`", r"<code>\\1</code>", s)
-        return s
+        return _MD_INLINE_RE.sub(_md_inline_sub, html.escape(text))
     except Exception:
         return html.escape(text)
 
 
+def _md_inline_sub(m: "re.Match[str]") -> str:
+    kind = m.lastgroup
+    if kind == "link":
+        # Labels, bold and italic text may themselves contain inline markup
+        label = _MD_INLINE_RE.sub(_md_inline_sub, m.group("label"))
+        return f'<a href="{m.group("link")}" target="_blank" rel="noopener noreferrer">{label}</a>'
+    if kind == "bold":
+        return f"<strong>{_MD_INLINE_RE.sub(_md_inline_sub, m.group('bold'))}</strong>"
+    if kind == "ital":
+        return f"<em>{_MD_INLINE_RE.sub(_md_inline_sub, m.group('ital'))}</em>"
+    return f"<code>{m.group('code')}</code>"
+
+
 def _render_filters_inline(ri: Any) -> str:
     try:
         if not isinstance(ri, dict):
@@ -2853,6 +3574,67 @@ def _render_filters_inline(ri: Any) -> str:
         return ""
 
 
+def _llm_kwargs(
+    model_name: str, messages: List[Dict[str, str]], timeout: int = 20
+) -> Dict[str, Any]:
+    """Shared litellm.acompletion kwargs; adds the OpenRouter key for openrouter/* models.
+
+    Other providers pick up their own keys from the environment.
+    """
+    kwargs: Dict[str, Any] = {
+        "model": model_name,
+        "messages": messages,
+        "timeout": timeout,
+    }
+    api_key = app_state.get("openrouter_key", "")
+    if api_key and model_name.startswith("openrouter/"):
+        kwargs["api_key"] = api_key
+    return kwargs
+
+
+def _response_content(resp: Any) -> str:
+    """Message text of a litellm ModelResponse, or "" when the shape is unexpected."""
+    try:
+        return resp.choices[0].message.content or ""
+    except (AttributeError, IndexError, TypeError):
+        return ""
+
+
+class EvidenceRow(NamedTuple):
+    """Display fields of one context as fed to the LLM critique."""
+
+    display: str
+    page: Optional[int]
+    snippet: str
+
+
+def _project_evidence(c: Any) -> Optional[EvidenceRow]:
+    """Project a context onto an EvidenceRow; None if its fields are unreadable."""
+    try:
+        txt_obj = getattr(c, "text", None)
+        doc = getattr(txt_obj, "doc", None) if txt_obj is not None else None
+        title = None
+        citation = None
+        if doc is not None:
+            citation = getattr(doc, "formatted_citation", None)
+            title = getattr(doc, "title", None) or getattr(doc, "docname", None)
+        page = getattr(c, "page", None)
+        raw_text = getattr(txt_obj, "text", None) if txt_obj is not None else None
+        snippet = (
+            raw_text
+            if isinstance(raw_text, str)
+            else (str(txt_obj) if txt_obj is not None else str(c))
+        )
+        row = EvidenceRow(
+            citation or title or "Unknown source",
+            int(page) if isinstance(page, (int, float)) else None,
+            _clip(snippet, 240),
+        )
+    except Exception:
+        return None
+    return row
+
+
 async def build_llm_or_heuristic_critique_html(
     question: str, answer: str, contexts: List, settings: Settings
 ) -> str:
@@ -2862,136 +3644,75 @@ async def build_llm_or_heuristic_critique_html(
     """
     try:
         model_name = str(getattr(settings, "llm", "") or "").strip()
-        if model_name:
-            try:
-                import litellm
-
-                # Build concise evidence bullets for the model
-                evidence_lines: List[str] = []
-                for c in (contexts or [])[:10]:
-                    try:
-                        txt_obj = getattr(c, "text", None)
-                        doc = (
-                            getattr(txt_obj, "doc", None)
-                            if txt_obj is not None
-                            else None
-                        )
-                        title = None
-                        citation = None
-                        if doc is not None:
-                            citation = getattr(doc, "formatted_citation", None)
-                            title = getattr(doc, "title", None) or getattr(
-                                doc, "docname", None
-                            )
-                        page = getattr(c, "page", None)
-                        raw_text = (
-                            getattr(txt_obj, "text", None)
-                            if txt_obj is not None
-                            else None
-                        )
-                        snippet = (
-                            raw_text
-                            if isinstance(raw_text, str)
-                            else (str(txt_obj) if txt_obj is not None else str(c))
-                        )
-                        if snippet and len(snippet) > 240:
-                            snippet = snippet[:240] + "..."
-                        display = citation or title or "Unknown source"
-                        pg = f" p.{int(page)}" if isinstance(page, (int, float)) else ""
-                        evidence_lines.append(f"- {display}{pg}: {snippet}")
-                    except Exception:
-                        continue
-
-                messages: List[Dict[str, str]] = [
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a scientific QA auditor. Provide a brief, critical assessment of the answer's support. "
-                            "Flag unsupported or overconfident claims, missing citations, and contradictory evidence. "
-                            "Be concise and actionable. Return 3-6 bullet points max."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Question:\n{question}\n\n"
-                            f"Answer:\n{answer}\n\n"
-                            "Evidence excerpts (doc/page: snippet):\n"
-                            + "\n".join(evidence_lines)
-                        ),
-                    },
-                ]
-
-                def _extract_content(resp: Any) -> str:
-                    try:
-                        choices = getattr(resp, "choices", None)
-                        if isinstance(choices, list) and choices:
-                            choice0 = choices[0]
-                            message = getattr(choice0, "message", None)
-                            if isinstance(message, dict):
-                                c = message.get("content")
-                                if isinstance(c, str):
-                                    return c
-                            c2 = getattr(message, "content", None)
-                            if isinstance(c2, str):
-                                return c2
-                        content_attr = getattr(resp, "content", None)
-                        if isinstance(content_attr, str):
-                            return content_attr
-                    except Exception:
-                        pass
-                    return ""
-
-                async def _go() -> str:
-                    kwargs: Dict[str, Any] = {
-                        "model": model_name,
-                        "messages": messages,
-                        "timeout": 20,
-                    }
-                    # Include OpenRouter API key if applicable; other providers use their own env keys
-                    api_key = os.getenv("OPENROUTER_API_KEY", "").strip()
-                    if api_key and model_name.startswith("openrouter/"):
-                        kwargs["api_key"] = api_key
-                    resp = await litellm.acompletion(**kwargs)
-                    return _extract_content(resp)
-
-                _ensure_query_loop()
-                fut = asyncio.run_coroutine_threadsafe(_go(), app_state["query_loop"])
-                content = await asyncio.to_thread(fut.result, timeout=45)
-                if isinstance(content, str) and content.strip():
-                    # Strip any leading numbering/bullet markers, including "\\1", "1.", "1)", "(1)", "-", "*"
-                    raw_lines = [
-                        ln.strip() for ln in content.splitlines() if ln.strip()
-                    ]
-                    cleaned_lines: List[str] = []
-                    for ln in raw_lines:
-                        # Fix the regex to properly handle escaped backslash-number sequences
-                        ln2 = re.sub(
-                            r"^\s*(?:\\\\?\d+\s+|\(\d+\)|\d+[\.)]|[-*•])\s*", "", ln
-                        )
-                        cleaned_lines.append(ln2)
-                    items_html: List[str] = []
-                    for ln in cleaned_lines[:6]:
-                        items_html.append(
-                            f"<li><small>{_render_markdown_inline(ln)}</small></li>"
-                        )
-                    if items_html:
-                        return (
-                            "<div class='pqa-subtle' style='margin-top:6px'>"
-                            + "<ul>"
-                            + "".join(items_html)
-                            + "</ul>"
-                            + "</div>"
-                        )
-                    # Fallback to plain rendered text
-                    fixed = _render_markdown_inline("\n".join(cleaned_lines))
+        if not model_name:
+            # No model configured: the heuristic critique needs no LLM round-trip
+            return build_critique_html(answer, contexts)
+        try:
+            # Build concise evidence bullets for the model
+            rows = [_project_evidence(c) for c in (contexts or [])[:10]]
+            evidence_lines: List[str] = [
+                f"- {r.display}{f' p.{r.page}' if r.page is not None else ''}: {r.snippet}"
+                for r in rows
+                if r is not None
+            ]
+
+            messages: List[Dict[str, str]] = [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a scientific QA auditor. Provide a brief, critical assessment of the answer's support. "
+                        "Flag unsupported or overconfident claims, missing citations, and contradictory evidence. "
+                        "Be concise and actionable. Return 3-6 bullet points max."
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Question:\n{question}\n\n"
+                        f"Answer:\n{answer}\n\n"
+                        "Evidence excerpts (doc/page: snippet):\n"
+                        + "\n".join(evidence_lines)
+                    ),
+                },
+            ]
+
+            async def _go() -> str:
+                resp = await litellm.acompletion(**_llm_kwargs(model_name, messages))
+                return _response_content(resp)
+
+            _ensure_query_loop()
+            fut = asyncio.run_coroutine_threadsafe(_go(), app_state["query_loop"])
+            content = await asyncio.to_thread(fut.result, timeout=45)
+            if isinstance(content, str) and content.strip():
+                # Strip any leading numbering/bullet markers, including "\\1", "1.", "1)", "(1)", "-", "*"
+                raw_lines = [ln.strip() for ln in content.splitlines() if ln.strip()]
+                cleaned_lines: List[str] = []
+                for ln in raw_lines:
+                    # Fix the regex to properly handle escaped backslash-number sequences
+                    ln2 = _BULLET_PREFIX_RE.sub("", ln)
+                    cleaned_lines.append(ln2)
+                items_html: List[str] = []
+                for ln in cleaned_lines[:6]:
+                    items_html.append(
+                        f"<li><small>{_render_markdown_inline(ln)}</small></li>"
+                    )
+                if items_html:
                     return (
                         "<div class='pqa-subtle' style='margin-top:6px'>"
-                        + f"<p><small>{fixed}</small></p>"
+                        + "<ul>"
+                        + "".join(items_html)
+                        + "</ul>"
                         + "</div>"
                     )
-            except Exception:
-                pass
+                # Fallback to plain rendered text
+                fixed = _render_markdown_inline("\n".join(cleaned_lines))
+                return (
+                    "<div class='pqa-subtle' style='margin-top:6px'>"
+                    + f"<p><small>{fixed}</small></p>"
+                    + "</div>"
+                )
+        except Exception:
+            pass
 
         # Fallback to heuristic critique
         return build_critique_html(answer, contexts)
@@ -3005,8 +3726,6 @@ async def llm_decompose_query(question: str, settings: Settings) -> Dict[str, An
     Returns a dict: {"rewritten": str, "filters": {"years": [start, end], "venues": [..], "fields": [..]}}
     """
     try:
-        import litellm
-
         model_name = str(getattr(settings, "llm", "") or "").strip()
         if not model_name:
             return {"rewritten": question, "filters": {}}
@@ -3056,20 +3775,13 @@ async def llm_decompose_query(question: str, settings: Settings) -> Dict[str, An
             pass
 
         async def _go() -> Any:
-            kwargs: Dict[str, Any] = {
-                "model": model_name,
-                "messages": messages,
-                "timeout": 20,
-            }
-            api_key = os.getenv("OPENROUTER_API_KEY", "").strip()
-            if api_key and model_name.startswith("openrouter/"):
-                kwargs["api_key"] = api_key
+            kwargs = _llm_kwargs(model_name, messages)
             try:
                 logger.info(
                     "LiteLLM acompletion start: model=%s timeout=%s has_api_key=%s",
                     kwargs.get("model"),
                     kwargs.get("timeout"),
-                    bool(api_key),
+                    "api_key" in kwargs,
                 )
             except Exception:
                 pass
@@ -3111,27 +3823,7 @@ async def llm_decompose_query(question: str, settings: Settings) -> Dict[str, An
         except Exception:
             pass
 
-        def _extract(resp_obj: Any) -> str:
-            try:
-                choices = getattr(resp_obj, "choices", None)
-                if isinstance(choices, list) and choices:
-                    m = getattr(choices[0], "message", None)
-                    if isinstance(m, dict):
-                        mc = m.get("content")
-                        if isinstance(mc, str):
-                            return mc
-                    c2 = getattr(m, "content", None)
-                    if isinstance(c2, str):
-                        return c2
-                c3 = getattr(resp_obj, "content", None)
-                if isinstance(c3, str):
-                    return c3
-            except Exception:
-                pass
-            return ""
-
-        content_res = _extract(resp)
-        content = content_res if isinstance(content_res, str) else ""
+        content = _response_content(resp)
 
         try:
             logger.info(
@@ -3147,13 +3839,13 @@ async def llm_decompose_query(question: str, settings: Settings) -> Dict[str, An
         fenced = txt.startswith("```")
         if fenced:
             try:
-                txt = re.sub(r"^```[a-zA-Z0-9]*\n?|```$", "", txt).strip()
+                txt = _FENCE_RE.sub("", txt).strip()
                 logger.info("LLM rewrite: stripped code fences from response")
             except Exception as fence_err:
                 logger.info("LLM rewrite: fence strip failed: %s", fence_err)
         data: Dict[str, Any]
         try:
-            data = json.loads(txt)
+            data = _json_loads(txt)
             try:
                 logger.info("LLM rewrite: JSON parsed successfully")
             except Exception:
@@ -3161,9 +3853,9 @@ async def llm_decompose_query(question: str, settings: Settings) -> Dict[str, An
         except Exception:
             # attempt to find JSON substring
             try:
-                m = re.search(r"\{[\s\S]*\}$", txt)
+                m = _JSON_TAIL_RE.search(txt)
                 if m:
-                    data = json.loads(m.group(0))
+                    data = _json_loads(m.group(0))
                     try:
                         logger.info("LLM rewrite: parsed JSON from substring match")
                     except Exception:
@@ -3225,8 +3917,15 @@ def rewrite_query(question: str, settings: Settings) -> str:
 
     This is a lightweight, local pass to improve retrieval robustness without external calls.
     """
+    # The rewrite does not depend on settings, so results are cached on the text alone
+    return _rewrite_query_cached(str(question))
+
+
+@functools.lru_cache(maxsize=256)
+def _rewrite_query_cached(question: str) -> str:
+    """Memoized body of rewrite_query."""
     # Normalize whitespace
-    q = " ".join(str(question).strip().split())
+    q = " ".join(question.strip().split())
 
     # Quick lowercase for leading filler detection; preserve original capitalization otherwise
     q_l = q.lower()
@@ -3238,32 +3937,15 @@ def rewrite_query(question: str, settings: Settings) -> str:
             break
 
     # Prefer imperative: "what is/are" → "summarize "
-    q = re.sub(r"^(?i)(what is|what are)\s+", "summarize ", q)
-
-    # Basic common typo fixes (minimal set; safe substitutions)
-    corrections = {
-        "alzheimer's": "Alzheimer's",
-        "parkinson's": "Parkinson's",
-        "alzeimer": "Alzheimer",
-        "alzheimer": "Alzheimer",
-        "behaviour": "behavior",
-        "analyse": "analyze",
-        "organisation": "organization",
-        "optimise": "optimize",
-    }
-
-    def _safe_fix(text: str) -> str:
-        out = text
-        for bad, good in corrections.items():
-            out = re.sub(rf"\b{bad}\b", good, out, flags=re.I)
-        return out
+    q = _WHAT_IS_RE.sub("summarize ", q)
 
-    q = _safe_fix(q)
+    # Basic common typo fixes (minimal set; safe substitutions), in one pass
+    q = _CORRECTIONS_RE.sub(lambda m: _QUERY_CORRECTIONS[m.group(0).lower()], q)
 
     # Normalize stray punctuation and excessive terminal punctuation
-    q = re.sub(r"\s+([,;:.!?])", r"\1", q)  # no space before punctuation
-    q = re.sub(r"([,;:.!?]){2,}", r"\1", q)  # collapse repeats
-    q = re.sub(r"[?!.]{2,}$", "?", q)  # end with single ? if repeated
+    q = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", q)  # no space before punctuation
+    q = _REPEATED_PUNCT_RE.sub(r"\1", q)  # collapse repeats
+    q = _TERMINAL_PUNCT_RE.sub("?", q)  # end with single ? if repeated
 
     # Capitalize first letter if sentence-like
     if q and q[0].isalpha():
@@ -3272,9 +3954,33 @@ def rewrite_query(question: str, settings: Settings) -> str:
     return q
 
 
+def _bundle_zip_opts() -> Dict[str, Any]:
+    """ZipFile options for export bundles from PAPERQA_BUNDLE_COMPRESS.
+
+    Members are small text files: "stored" (or 0) skips compression and 1-9 is the
+    deflate level (default 1, nearly the ratio of 6 at a fraction of the time).
+    """
+    level = os.getenv("PAPERQA_BUNDLE_COMPRESS", "1").strip().lower()
+    if level in ("stored", "0"):
+        return {"compression": zipfile.ZIP_STORED}
+    if level not in ("1", "2", "3", "4", "5", "6", "7", "8", "9"):
+        # zlib rejects anything else, which would fail every bundle export
+        logger.warning(
+            f"Invalid PAPERQA_BUNDLE_COMPRESS={level!r}; using deflate level 1"
+        )
+        level = "1"
+    return {"compression": zipfile.ZIP_DEFLATED, "compresslevel": int(level)}
+
+
 def clear_all() -> Tuple[str, str, str, str, str, str, str, str]:
     """Clear all uploaded documents and reset the interface."""
     app_state["uploaded_docs"] = []
+    # Drop the indexed corpus and everything derived from it, in memory and on disk
+    app_state["docs"] = None
+    app_state["answer_cache"] = None
+    app_state["session_data"] = None
+    app_state["export_cache"].clear()
+    _DOCS_CACHE_PATH.unlink(missing_ok=True)
     app_state["processing_status"] = ""
     app_state["auto_ran_retrieval"] = False
 
@@ -3290,90 +3996,18 @@ def clear_all() -> Tuple[str, str, str, str, str, str, str, str]:
 try:
     initialize_settings("optimized_ollama")
     logger.info("✅ Initialized with optimized Ollama configuration")
+    _load_docs_cache(app_state["settings"])
 except Exception as e:
     logger.error(f"❌ Failed to initialize settings: {e}")
 
+# Start the query loop (and its pooled HTTP client) before the first request
+_ensure_query_loop()
+
 # Create Gradio interface
-with gr.Blocks(title="Paper-QA UI", theme=gr.themes.Soft()) as demo:
+# Theme and stylesheet (static/pqa.css) are applied at launch, see src/ui/__main__.py
+with gr.Blocks(title="Paper-QA UI") as demo:
     gr.Markdown("# 📚 Paper-QA UI")
     gr.Markdown("Upload PDF documents and ask questions using local Ollama models.")
-    gr.HTML(
-        """
-        <style>
-        .pqa-panel { background: #ffffff; color: #111827; padding: 12px; border-radius: 6px; }
-        .pqa-subtle { background: #f3f4f6; color: inherit; padding: 10px; border-radius: 5px; }
-        .pqa-muted { color: #6b7280; }
-        .pqa-table { width: 100%; border-collapse: collapse; }
-        .pqa-table th, .pqa-table td { padding: 6px; border-bottom: 1px solid #e5e7eb; text-align: left; }
-        /* Chevron step badges */
-        .pqa-steps { display: flex; gap: 6px; align-items: center; margin: 6px 0; flex-wrap: wrap; }
-        .pqa-step { position: relative; display: inline-block; background: #e5e7eb; color: #111827; padding: 6px 16px 6px 16px; font-size: 12px; line-height: 1; }
-        .pqa-step::before { content: ""; position: absolute; top: 0; left: -10px; width: 0; height: 0; border-top: 12px solid transparent; border-bottom: 12px solid transparent; border-right: 10px solid #e5e7eb; }
-        .pqa-step::after { content: ""; position: absolute; top: 0; right: -10px; width: 0; height: 0; border-top: 12px solid transparent; border-bottom: 12px solid transparent; border-left: 10px solid #e5e7eb; }
-        .pqa-step.active { background: #3b82f6; color: white; }
-        .pqa-step.active::before { border-right-color: #3b82f6; }
-        .pqa-step.active::after { border-left-color: #3b82f6; }
-        .pqa-step.done { background: #10b981; color: #ffffff; }
-        .pqa-step.done::after { border-left-color: #10b981; }
-        .pqa-step.done::before { border-right-color: #10b981; }
-        .pqa-step:first-child::before { display: none; }
-        /* Indeterminate progress bar */
-        .pqa-bar { height: 10px; border-radius: 6px; overflow: hidden; position: relative; }
-        .pqa-bar-fill { height: 100%; background: #3b82f6; }
-        .pqa-bar-indet { background-image: linear-gradient(45deg, rgba(255,255,255,0.15) 25%, transparent 25%, transparent 50%, rgba(255,255,255,0.15) 50%, rgba(255,255,255,0.15) 75%, transparent 75%, transparent); background-size: 20px 20px; animation: pqa-stripes 1s linear infinite; }
-        @keyframes pqa-stripes { 0% { background-position: 0 0; } 100% { background-position: 40px 0; } }
-        @media (prefers-color-scheme: dark) {
-          .pqa-panel { background: #1f2937; color: #e5e7eb; }
-          .pqa-subtle { background: #111827; color: #e5e7eb; }
-          .pqa-muted { color: #9ca3af; }
-          .pqa-table th, .pqa-table td { border-bottom-color: #374151; }
-          .pqa-step { background: #374151; color: #e5e7eb; }
-          .pqa-step::after { border-left-color: #374151; }
-          .pqa-step::before { border-right-color: #374151; }
-          .pqa-step.done { background: #059669; color: #ffffff; }
-          .pqa-step.done::after { border-left-color: #059669; }
-          .pqa-step.done::before { border-right-color: #059669; }
-        }
-        /* Consistent panel content sizing & typography */
-        #inline-analysis,
-        #answer-panel,
-        #sources-panel,
-        #intelligence-panel,
-        #metadata-panel {
-          max-height: 600px; /* default height for most panels */
-          overflow-y: auto;
-          font-size: 16px;
-          line-height: 1.55;
-        }
-        /* Ensure inline annotations are not tiny */
-        #inline-analysis small,
-        #answer-panel small,
-        #sources-panel small,
-        #intelligence-panel small,
-        #metadata-panel small {
-          font-size: 1em;
-        }
-        /* Make Live Analysis significantly taller for visibility */
-        #inline-analysis {
-          height: clamp(500px, 70vh, 1100px);
-          max-height: none;
-        }
-
-        /* Layout polish */
-        .pqa-section { margin: 8px 0; }
-        .pqa-panel { margin: 8px 0; }
-        .pqa-subtle { margin: 8px 0; }
-
-        /* Responsive: stack rails and center column on narrow screens */
-        @media (max-width: 980px) {
-          .gr-row > .gr-column { flex: 1 1 100% !important; max-width: 100% !important; }
-          #inline-analysis, #answer-panel, #sources-panel, #intelligence-panel, #metadata-panel { max-height: unset; height: auto; }
-        }
-        /* Export buttons styling */
-        #export-buttons .gr-button { display: inline-block; font-weight: 400; margin-right: 8px; }
-        </style>
-        """
-    )
 
     with gr.Row():
         # Left rail (accordion sections; UI-only reorganization)
@@ -3396,6 +4030,9 @@ with gr.Blocks(title="Paper-QA UI", theme=gr.themes.Soft()) as demo:
 
                 def _on_config_change(cfg: str) -> str:
                     app_state["settings"] = initialize_settings(cfg)
+                    app_state["openrouter_key"] = os.getenv(
+                        "OPENROUTER_API_KEY", ""
+                    ).strip()
                     return f"Configuration set to: {cfg}"
 
                 config_dropdown = gr.Dropdown(
@@ -3650,61 +4287,144 @@ with gr.Blocks(title="Paper-QA UI", theme=gr.themes.Soft()) as demo:
         p.mkdir(exist_ok=True)
         return p
 
-    def export_json() -> str:
+    def _build_json_bytes() -> bytes:
         data = app_state.get("session_data") or {}
         # include trace if present
         trace = app_state.get("session_trace") or []
         if trace:
             data = {**data, "trace": trace}
-        outdir = _ensure_exports_dir()
-        fname = f"session_{int(time.time())}.json"
-        fpath = outdir / fname
-        with open(fpath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return str(fpath)
+        return _json_dumps(data)
 
-    def export_csv() -> str:
+    def _build_csv_bytes() -> bytes:
         data = app_state.get("session_data") or {}
         contexts = data.get("contexts") or []
-        outdir = _ensure_exports_dir()
-        fname = f"contexts_{int(time.time())}.csv"
-        fpath = outdir / fname
-        with open(fpath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["doc", "page", "score", "text"])
-            for c in contexts:
-                writer.writerow(
-                    [
-                        c.get("doc"),
-                        c.get("page"),
-                        c.get("score"),
-                        (c.get("text") or "").replace("\n", " ")[:4000],
-                    ]
-                )
-        return str(fpath)
+        # Drop repeated chunks (overlapping retrievals); the JSON export keeps all
+        seen: set = set()
+        contexts = [
+            c
+            for c in contexts
+            if (k := (c.get("doc"), c.get("page"), c.get("text"))) not in seen
+            and not seen.add(k)
+        ]
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf)
+        writer.writerow(["doc", "page", "score", "text"])
+        writer.writerows(
+            (
+                c.get("doc"),
+                c.get("page"),
+                c.get("score"),
+                (c.get("text") or "")[:4000].replace("\n", " "),
+            )
+            for c in contexts
+        )
+        return buf.getvalue().encode("utf-8")
 
-    def export_trace() -> str:
+    def _build_trace_bytes() -> bytes:
         trace = app_state.get("session_trace") or []
-        outdir = _ensure_exports_dir()
-        fname = f"trace_{int(time.time())}.jsonl"
-        fpath = outdir / fname
-        with open(fpath, "w", encoding="utf-8") as f:
-            for ev in trace:
-                f.write(json.dumps(ev, ensure_ascii=False))
-                f.write("\n")
+        return b"".join(map(_jsonl_line, trace))
+
+    def _cached_export(kind: str, build: Any) -> bytes:
+        # Trace length is part of the key since the trace is not tied to session_data
+        key = (kind, len(app_state.get("session_trace") or []))
+        cache = app_state["export_cache"]
+        data = cache.get(key)
+        if data is None:
+            data = cache[key] = build()
+        return data
+
+    def _export_file(kind: str, build: Any, fname: str) -> str:
+        # Reuse the file from an earlier click when the content has not changed
+        cache = app_state["export_cache"]
+        data = _cached_export(kind, build)
+        prev = cache.get((kind, "path"))
+        if prev is not None and prev[0] is data and Path(prev[1]).exists():
+            return prev[1]
+        fpath = _ensure_exports_dir() / fname
+        _write_file(fpath, data)
+        cache[(kind, "path")] = (data, str(fpath))
         return str(fpath)
 
+    def _write_file(fpath: Path, data: bytes) -> None:
+        # Raw fd writes: one syscall for the pre-rendered buffer, no io wrappers
+        fd = os.open(fpath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+
+    _export_locks: Dict[str, threading.Lock] = {}
+    _last_export: Dict[str, Tuple[float, str]] = {}
+
+    def _debounced(name: str, window_s: float) -> Any:
+        # Coalesce double-clicks: concurrent calls serialize on a per-export lock
+        # and a repeat within window_s returns the previous result
+        lock = _export_locks.setdefault(name, threading.Lock())
+
+        def deco(fn: Any) -> Any:
+            @functools.wraps(fn)
+            def wrapper() -> str:
+                with lock:
+                    last = _last_export.get(name)
+                    now = time.monotonic()
+                    if last is not None and now - last[0] < window_s:
+                        return last[1]
+                    result = fn()
+                    _last_export[name] = (time.monotonic(), result)
+                    return result
+
+            return wrapper
+
+        return deco
+
+    @_debounced("json", 0.5)
+    def export_json() -> str:
+        return _export_file(
+            "json", _build_json_bytes, f"session_{next(_EXPORT_COUNTER)}.json"
+        )
+
+    @_debounced("csv", 0.5)
+    def export_csv() -> str:
+        return _export_file(
+            "csv", _build_csv_bytes, f"contexts_{next(_EXPORT_COUNTER)}.csv"
+        )
+
+    @_debounced("trace", 0.5)
+    def export_trace() -> str:
+        return _export_file(
+            "trace", _build_trace_bytes, f"trace_{next(_EXPORT_COUNTER)}.jsonl"
+        )
+
+    @_debounced("bundle", 0.5)
     def export_bundle() -> str:
+        members = (
+            _cached_export("json", _build_json_bytes),
+            _cached_export("csv", _build_csv_bytes),
+            _cached_export("trace", _build_trace_bytes),
+        )
+        cache = app_state["export_cache"]
+        prev = cache.get(("bundle", "path"))
+        if (
+            prev is not None
+            and all(x is y for x, y in zip(prev[0], members))
+            and Path(prev[1]).exists()
+        ):
+            return prev[1]
         outdir = _ensure_exports_dir()
-        ts = int(time.time())
-        json_path = Path(export_json())
-        csv_path = Path(export_csv())
-        trace_path = Path(export_trace())
+        ts = next(_EXPORT_COUNTER)
         zip_path = outdir / f"bundle_{ts}.zip"
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.write(json_path, arcname=json_path.name)
-            zf.write(csv_path, arcname=csv_path.name)
-            zf.write(trace_path, arcname=trace_path.name)
+        zip_opts = _bundle_zip_opts()
+        names = (f"session_{ts}.json", f"contexts_{ts}.csv", f"trace_{ts}.jsonl")
+        # Assemble the archive in memory so the headers, members and central
+        # directory reach disk in a single write instead of many small ones
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", **zip_opts) as zf:
+            for name, data in zip(names, members):
+                zf.writestr(name, data)
+        _write_file(zip_path, buf.getvalue())
+        cache[("bundle", "path")] = (members, str(zip_path))
         return str(zip_path)
 
     ask_button.click(
@@ -3962,27 +4682,14 @@ with gr.Blocks(title="Paper-QA UI", theme=gr.themes.Soft()) as demo:
     )
 
     # Wire export buttons
-    export_json_btn.click(fn=export_json, outputs=[export_json_btn])
-    export_csv_btn.click(fn=export_csv, outputs=[export_csv_btn])
-    export_trace_btn.click(fn=export_trace, outputs=[export_trace_btn])
-    export_bundle_btn.click(fn=export_bundle, outputs=[export_bundle_btn])
+    def _off_thread(fn: Any) -> Any:
+        # Run blocking export work in a worker thread; the handler itself is async
+        async def _run() -> str:
+            return await asyncio.to_thread(fn)
 
-if __name__ == "__main__":
-    import os
+        return _run
 
-    # Suppress Gradio version warning
-    os.environ["GRADIO_ANALYTICS_ENABLED"] = "False"
-
-    try:
-        demo.launch(
-            server_name="0.0.0.0",
-            server_port=7860,
-            share=False,
-            show_error=True,
-            quiet=False,
-        )
-    except OSError as e:
-        if "address already in use" in str(e):
-            print("❌ Port 7860 is already in use. Try: make kill-server")
-        else:
-            raise
+    export_json_btn.click(fn=_off_thread(export_json), outputs=[export_json_btn])
+    export_csv_btn.click(fn=_off_thread(export_csv), outputs=[export_csv_btn])
+    export_trace_btn.click(fn=_off_thread(export_trace), outputs=[export_trace_btn])
+    export_bundle_btn.click(fn=_off_thread(export_bundle), outputs=[export_bundle_btn])
@@ -0,0 +1,21 @@
+# Document parsing run in worker processes so CPU-bound PDF extraction and chunking
+# of several uploads proceed on separate cores instead of queueing behind the GIL.
+# Spawned workers import only this module and paper-qa; the app is launched via
+# ``python -m src.ui`` so multiprocessing does not re-import the UI as __mp_main__.
+
+import asyncio
+
+from paperqa import Docs, Settings
+
+
+def parse_document(path: str, settings: Settings) -> Docs:
+    """Parse and chunk one file into a standalone Docs, without embedding it.
+
+    Embedding is deferred so the parent process can embed the returned texts
+    through its shared embedding cache when merging them with ``Docs.aadd_texts``.
+    """
+    settings = settings.model_copy(deep=True)
+    settings.parsing.defer_embedding = True
+    docs = Docs()
+    asyncio.run(docs.aadd(path, settings=settings))
+    return docs
@@ -0,0 +1,286 @@
+"""
+Test UI helpers: panel renderers, answer streaming and the on-disk/answer caches
+"""
+
+import asyncio
+import re
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("paperqa")
+pytest.importorskip("gradio")
+
+from src.ui import paperqa2_ui as ui  # noqa: E402
+
+
+def _context(doc_title: str, text: str) -> SimpleNamespace:
+    doc = SimpleNamespace(formatted_citation=doc_title)
+    return SimpleNamespace(
+        text=SimpleNamespace(text=text, doc=doc, name=doc_title),
+        page=1,
+        score=0.5,
+    )
+
+
+CONFLICTING_CONTEXTS = [
+    _context("Smith 2020", "Treatment was linked to an increase in survival."),
+    _context("Jones 2021", "Treatment was linked to a decrease in survival."),
+]
+
+
+def test_conflicts_panel_renders_one_conflict() -> None:
+    """A single antonym conflict is listed rather than failing the panel."""
+    out = ui.build_conflicts_html("", CONFLICTING_CONTEXTS)
+    assert "Conflicts analysis unavailable" not in out
+    assert "<li>Conflicting findings on 'increase' vs 'decrease'" in out
+
+
+def test_intelligence_panel_renders_one_conflict() -> None:
+    """The Research Intel panel lists the cross-source contradiction."""
+    out = ui.build_intelligence_html("", CONFLICTING_CONTEXTS)
+    assert "Research Intel unavailable" not in out
+    assert "mentions 'increase', while" in out
+
+
+def test_intelligence_panel_lists_conflicts_in_doc_pair_order() -> None:
+    """The top 8 antonym conflicts follow the (doc a, doc b) walk, not the word pairs."""
+    text = "Scores saw an increase, a decrease, higher and lower values."
+    names = ["Doc A", "Doc B", "Doc C", "Doc D"]
+    out = ui.build_intelligence_html("", [_context(n, text) for n in names])
+    items = re.findall(r"<li>(.*?)</li>", out)
+    expected = []
+    for i, a in enumerate(names):
+        for b in names[i + 1 :]:
+            for w1, w2 in (("increase", "decrease"), ("higher", "lower")):
+                expected.append(f"{a} mentions '{w1}', while {b} mentions '{w2}'.")
+                expected.append(f"{a} mentions '{w2}', while {b} mentions '{w1}'.")
+    assert items[:8] == expected[:8]
+
+
+def test_esc_is_memoized() -> None:
+    """_esc keeps its lru_cache so recurring doc names are escaped once."""
+    assert ui._esc("a<b") == "a&lt;b"
+    assert hasattr(ui._esc, "cache_info")
+
+
+class _FakeDocs:
+    """Records which calls received callbacks."""
+
+    def __init__(self) -> None:
+        self.evidence_callbacks: object = "unset"
+        self.query_callbacks: object = "unset"
+
+    async def aget_evidence(self, question, settings=None, callbacks=None):  # type: ignore
+        self.evidence_callbacks = callbacks
+        return SimpleNamespace(question=question, contexts=["ctx"])
+
+    async def aquery(self, session, settings=None, callbacks=None):  # type: ignore
+        self.query_callbacks = callbacks
+        for cb in callbacks or []:
+            cb("tok")
+        return session
+
+
+def test_streaming_answer_excludes_evidence_step() -> None:
+    """Only the answer step streams; evidence gathering gets no callbacks."""
+    docs = _FakeDocs()
+    tokens: list = []
+    asyncio.run(
+        ui._query_streaming_answer(docs, "q", None, tokens.append)  # type: ignore
+    )
+    assert docs.evidence_callbacks is None
+    assert tokens == ["tok"]
+
+
+def test_answer_cache_matches_only_the_same_question() -> None:
+    """Rewordings that flip meaning miss; case/spacing/punctuation changes hit."""
+    ui.app_state["answer_cache"] = None
+    key = ("settings", (), "curation", "toggles", False, False)
+    ui._answer_cache_store(key, "Does X increase Y?", "cached")
+    try:
+        assert ui._answer_cache_lookup(key, "does  x increase y") == "cached"
+        assert ui._answer_cache_lookup(key, "Does X decrease Y?") is None
+        assert ui._answer_cache_lookup(key[:-1] + (True,), "Does X increase Y?") is None
+    finally:
+        ui.app_state["answer_cache"] = None
+
+
+def test_answer_cache_key_tracks_output_toggles() -> None:
+    """Panel toggles and quote extraction change the cached outputs' key."""
+    settings = ui.Settings()
+    saved = {k: ui.app_state.get(k) for k in ("ui_toggles", "use_quote_extraction")}
+    try:
+        ui.app_state["ui_toggles"] = {"show_flags": True, "show_conflicts": True}
+        ui.app_state["use_quote_extraction"] = False
+        base = ui._answer_cache_key(settings, False)
+        ui.app_state["ui_toggles"] = {"show_flags": False, "show_conflicts": True}
+        assert ui._answer_cache_key(settings, False) != base
+        ui.app_state["ui_toggles"] = {"show_flags": True, "show_conflicts": True}
+        ui.app_state["use_quote_extraction"] = True
+        assert ui._answer_cache_key(settings, False) != base
+    finally:
+        ui.app_state.update(saved)
+
+
+def test_critique_flags_risky_terms_inside_words() -> None:
+    """Strong-language check keeps substring semantics ('firstly', 'novelty')."""
+    assert "Contains strong language" in ui.build_critique_html("Firstly, X.", [1])
+    assert "Contains strong language" not in ui.build_critique_html("X may help.", [1])
+
+
+def test_critique_length_uses_whitespace_split() -> None:
+    """Runs of spaces and newlines do not inflate the word count."""
+    padded = "  ".join(["word"] * 200) + "\n" * 80
+    assert "Answer is long" not in ui.build_critique_html(padded, [1])
+    assert "Answer is long" in ui.build_critique_html("w\nx " * 126, [1])
+
+
+def test_clear_all_drops_indexed_corpus() -> None:
+    """After clearing, the next question cannot answer from the old corpus."""
+    keys = ("docs", "answer_cache", "session_data", "status_tracker")
+    saved = {k: ui.app_state.get(k) for k in keys}
+    try:
+        ui.app_state["status_tracker"] = ui.StatusTracker()
+        ui.app_state["docs"] = object()
+        ui.app_state["answer_cache"] = {"key": (), "payloads": {}}
+        ui.app_state["session_data"] = {"question": "q"}
+        ui.clear_all()
+        assert ui.app_state["docs"] is None
+        assert ui.app_state["answer_cache"] is None
+        assert ui.app_state["session_data"] is None
+    finally:
+        ui.app_state.update(saved)
+
+
+def test_embedding_cache_round_trips_at_float32_precision(tmp_path: Path) -> None:
+    """Vectors read back from disk match the originals to float32 precision."""
+    vec = [0.123456789, -1.0e-5, 3.14159265, 1.0e-8, -0.999999]
+    ui.EmbeddingCache(tmp_path / "emb.sqlite").set_many("m", {b"d": vec})
+    # A fresh instance has an empty LRU, so this read comes from SQLite
+    got = ui.EmbeddingCache(tmp_path / "emb.sqlite").get_many("m", [b"d"])[b"d"]
+    assert got == pytest.approx(vec, rel=1e-6, abs=1e-12)
+
+
+def test_ollama_concurrency_is_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ollama gets one request at a time unless OLLAMA_NUM_PARALLEL is set."""
+    monkeypatch.delenv("OLLAMA_NUM_PARALLEL", raising=False)
+    assert ui._ollama_parallel() == 1
+    monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "4")
+    assert ui._ollama_parallel() == 4
+
+
+def test_failed_docs_rebuild_reports_error_and_cancels(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A timed-out rebuild is cancelled and ends the stream with an error panel."""
+    cancelled = []
+
+    class _SlowDocs:
+        async def aadd(self, *args, **kwargs):  # type: ignore
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+    submitted = []
+    monkeypatch.setattr(ui, "Docs", _SlowDocs)
+    monkeypatch.setattr(ui, "_DOCS_REBUILD_TIMEOUT_S", 0.2)
+    monkeypatch.setattr(ui, "_cached_embedding_model", lambda settings: None)
+    monkeypatch.setattr(ui._EXECUTOR, "submit", lambda *a: submitted.append(a))
+    keys = ("docs", "settings", "uploaded_docs")
+    saved = {k: ui.app_state.get(k) for k in keys}
+    try:
+        ui.app_state["docs"] = None
+        ui.app_state["settings"] = object()
+        ui.app_state["uploaded_docs"] = [{"path": "a.pdf", "filename": "a.pdf"}]
+        panels = list(ui.stream_analysis_progress("q"))
+        assert len(panels) == 1
+        assert "Failed to rebuild the document index" in panels[0]
+        assert ui.app_state["docs"] is None
+        assert not submitted
+        for _ in range(50):
+            if cancelled:
+                break
+            time.sleep(0.02)
+        assert cancelled
+    finally:
+        ui.app_state.update(saved)
+
+
+def _stream_events(monkeypatch: pytest.MonkeyPatch, events: list) -> list:
+    """Run stream_analysis_progress with a worker that emits ``events``."""
+    from concurrent.futures import Future
+
+    def _submit(fn, question, settings, docs, q):  # type: ignore
+        for evt in events:
+            q.put_nowait(evt)
+        done: Future = Future()
+        done.set_result(None)
+        return done
+
+    monkeypatch.setattr(ui._EXECUTOR, "submit", _submit)
+    saved = {k: ui.app_state.get(k) for k in ("docs", "settings")}
+    try:
+        ui.app_state["docs"] = object()
+        ui.app_state["settings"] = SimpleNamespace()
+        return list(ui.stream_analysis_progress("q"))
+    finally:
+        ui.app_state.update(saved)
+
+
+def test_analysis_stream_renders_updated_latency(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A metric event that changes the latency re-renders the panel."""
+    panels = _stream_events(
+        monkeypatch,
+        [
+            {"type": "metric", "data": {"contexts_selected": 1, "elapsed_s": 0.5}},
+            {"type": "metric", "data": {"contexts_selected": 1, "elapsed_s": 1.25}},
+        ],
+    )
+    assert any("embed_latency=0.50s" in p for p in panels)
+    assert any("embed_latency=1.25s" in p for p in panels[:-1])
+
+
+def test_analysis_stream_skips_no_op_phase_markers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Summaries/answer phase markers do not rebuild the panel."""
+    marker = {"type": "phase", "data": {"phase": "answer", "status": "end"}}
+    assert len(_stream_events(monkeypatch, [marker] * 3)) == 2
+
+
+def test_build_settings_reuses_parsed_config_not_settings(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The config JSON is parsed once; each call still gets its own Settings."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "configs" / "t.json").write_text('{"llm": "gpt-4o-mini"}')
+    ui._load_config_cached.cache_clear()
+    first = ui._build_settings("t")
+    first.answer.evidence_k = 999
+    second = ui._build_settings("t")
+    assert second is not first
+    assert second.answer.evidence_k != 999
+    assert ui._load_config_cached.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("stored", None), ("0", None), ("9", 9), ("10", 1), ("fast", 1), ("-1", 1)],
+)
+def test_bundle_compression_level_is_valid_for_zlib(
+    monkeypatch: pytest.MonkeyPatch, value: str, expected: object
+) -> None:
+    """Out-of-range PAPERQA_BUNDLE_COMPRESS values fall back to level 1."""
+    monkeypatch.setenv("PAPERQA_BUNDLE_COMPRESS", value)
+    opts = ui._bundle_zip_opts()
+    assert opts.get("compresslevel") == expected
+    with ui.zipfile.ZipFile(ui.io.BytesIO(), "w", **opts) as zf:
+        zf.writestr("a.txt", "data")